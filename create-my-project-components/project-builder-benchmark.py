@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# Benchmarks for project-builder.py
+# Generates synthetic project-structure files in the builder's ASCII-art format, then times
+# parse_structure_file, generate_paths, create_project_structure and print_tree on each of them,
+# reporting seconds and peak memory per stage. Results can be saved as a baseline and compared later.
+#
+# python3 project-builder-benchmark.py                                  # 100 to 100k lines
+# python3 project-builder-benchmark.py --sizes 100,1000,1000000         # up to 1M lines
+# python3 project-builder-benchmark.py --save-baseline baseline.json
+# python3 project-builder-benchmark.py --compare baseline.json          # exits 1 on a regression
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import importlib.util
+from shutil import rmtree
+
+# art styles: (branch, last branch, continuation), each part the same width so children line up under their parent's name
+art_styles = {
+    "unicode": ("├── ", "└── ", "│   "),
+    "short":   ("├─ ",  "└─ ",  "│  "),
+    "ascii":   ("|-- ", "`-- ", "|   "),
+    "plus":    ("+-- ", "+-- ", "|   "),
+}
+stages = ["parse", "generate", "create", "print_tree"]
+
+class Colors:
+    RED = '\033[91m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    CYAN = '\033[96m'
+    RESET = '\033[0m'
+    BOLD = '\033[1m'
+
+def load_builder(path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "project-builder.py")):
+    """Import project-builder.py (its name is not a valid module name, so by path)."""
+    spec = importlib.util.spec_from_file_location("project_builder", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def generate_structure(file_path, lines, depth=6, fanout=8, style="unicode", seed=0):
+    """
+    Write a synthetic project-structure file of (about) the given number of lines.
+    Every directory gets up to fanout children, roughly a third of them directories, down to depth levels.
+    style is one of art_styles, or "mixed" to pick a style per directory.
+    """
+    rng = random.Random(seed)
+    counter = 0
+    written = 1
+    with open(file_path, "w") as f:
+        f.write("bench/\n")
+        # depth-first, with an explicit stack of (prefix, level, children left, style)
+        stack = [("", 1, fanout, style if style != "mixed" else rng.choice(list(art_styles)))]
+        while stack and written < lines:
+            prefix, level, left, level_style = stack[-1]
+            if left == 0:
+                stack.pop()
+                if not stack: # ran out of tree, start another top-level branch
+                    stack.append(("", 1, fanout, level_style))
+                continue
+            stack[-1] = (prefix, level, left - 1, level_style)
+            branch, last_branch, continuation = art_styles[level_style]
+            pointer = last_branch if left == 1 else branch
+            counter += 1
+            is_dir = level < depth and rng.random() < 0.35
+            name = f"d{counter}/" if is_dir else f"file{counter}.txt"
+            f.write(prefix + pointer + name + "\n")
+            written += 1
+            if is_dir:
+                child_prefix = prefix + (" " * len(continuation) if left == 1 else continuation)
+                child_style = style if style != "mixed" else rng.choice(list(art_styles))
+                # a child style must be as wide as ours, or the child's art would miss our name
+                if len(art_styles[child_style][2]) != len(continuation): child_style = level_style
+                stack.append((child_prefix, level + 1, rng.randint(1, fanout), child_style))
+    return written
+
+def measure(function, track_memory):
+    """Run function once, returning (result, seconds, peak bytes or None)."""
+    import tracemalloc
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = function()
+    finally:
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if track_memory else None
+        if track_memory: tracemalloc.stop()
+    return result, seconds, peak
+
+def run_benchmarks(builder, sizes, depth, fanout, style, tmpdir, track_memory=True):
+    """Run every stage for every size, returning {size: {stage: {"seconds": s, "peak_bytes": b}}}."""
+    results = {}
+    for size in sizes:
+        workdir = tempfile.mkdtemp(prefix="project-builder-bench-", dir=tmpdir)
+        try:
+            structure_file = os.path.join(workdir, "project-structure")
+            target = os.path.join(workdir, "bench")
+            os.mkdir(target)
+            generate_structure(structure_file, size, depth, fanout, style)
+            stage_results = {}
+            lines_dict, stage_results["parse"] = _stage(lambda: builder.parse_structure_file(structure_file), track_memory)
+            paths, stage_results["generate"] = _stage(lambda: builder.generate_paths(lines_dict), track_memory)
+            _, stage_results["create"] = _stage(lambda: builder.create_project_structure(paths, root=target), track_memory)
+            with open(os.devnull, "w") as devnull:
+                _, stage_results["print_tree"] = _stage(
+                    lambda: builder.print_tree(target, max_entries=0, collapse=[], out=devnull), track_memory)
+            results[str(size)] = stage_results
+            print_results({str(size): stage_results}, header=not results.keys() - {str(size)})
+        finally:
+            rmtree(workdir, ignore_errors=True)
+    return results
+
+def _stage(function, track_memory):
+    result, seconds, peak = measure(function, track_memory)
+    return result, {"seconds": seconds, "peak_bytes": peak}
+
+def print_results(results, header=True):
+    """Print one row per size and stage."""
+    if header:
+        print(f"{Colors.BOLD}{'lines':>9}  {'stage':<11} {'seconds':>10} {'peak MB':>9}{Colors.RESET}")
+    for size, stage_results in results.items():
+        for stage in stages:
+            timing = stage_results[stage]
+            peak = f"{timing['peak_bytes'] / (1024 * 1024):9.1f}" if timing["peak_bytes"] is not None else f"{'-':>9}"
+            print(f"{size:>9}  {stage:<11} {timing['seconds']:10.4f} {peak}")
+
+def compare_with_baseline(results, baseline, tolerance, noise_floor=0.005):
+    """List regressions: stages slower than the baseline by more than tolerance (and more than noise_floor seconds)."""
+    regressions = []
+    for size, stage_results in results.items():
+        for stage, timing in stage_results.items():
+            reference = baseline.get(size, {}).get(stage)
+            if not reference: continue
+            slower_by = timing["seconds"] - reference["seconds"]
+            if slower_by > noise_floor and timing["seconds"] > reference["seconds"] * (1 + tolerance):
+                regressions.append((size, stage, reference["seconds"], timing["seconds"]))
+    return regressions
+
+def main():
+    default_tmpdir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir() # tmpfs, so we time our code and not the disk
+    parser = argparse.ArgumentParser(description="Benchmark project-builder.py on synthetic structure files.")
+    parser.add_argument("--sizes", default="100,1000,10000,100000", help="comma separated line counts (default: %(default)s)")
+    parser.add_argument("--depth", type=int, default=6, help="deepest directory level (default: %(default)s)")
+    parser.add_argument("--fanout", type=int, default=8, help="most children per directory (default: %(default)s)")
+    parser.add_argument("--style", default="unicode", choices=list(art_styles) + ["mixed"], help="art style (default: %(default)s)")
+    parser.add_argument("--tmpdir", default=default_tmpdir, help="where the trees are created (default: %(default)s)")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows every stage down")
+    parser.add_argument("--builder", default=None, help="path to project-builder.py (default: next to this script)")
+    parser.add_argument("--generate", metavar="FILE", help="only write a structure file of the first size to FILE")
+    parser.add_argument("--save-baseline", metavar="FILE", help="save the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results with a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a regression (default: %(default)s)")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    if args.generate:
+        written = generate_structure(args.generate, sizes[0], args.depth, args.fanout, args.style)
+        print(f"Wrote {written} lines to {args.generate}")
+        return 0
+
+    builder = load_builder(args.builder) if args.builder else load_builder()
+    results = run_benchmarks(builder, sizes, args.depth, args.fanout, args.style, args.tmpdir, not args.no_memory)
+    memory_mode = "no-memory" if args.no_memory else "tracemalloc" # tracemalloc slows every stage, so timings only compare within a mode
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"mode": memory_mode, "results": results}, f, indent=2)
+        print(f"\n{Colors.GREEN}Baseline saved to {args.save_baseline}{Colors.RESET}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["mode"] != memory_mode:
+            print(f"\n{Colors.RED}{args.compare} was measured in {baseline['mode']} mode, this run in {memory_mode} mode; "
+                  f"rerun with{'out' if args.no_memory else ''} --no-memory to compare{Colors.RESET}")
+            return 2
+        regressions = compare_with_baseline(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\n{Colors.RED}{len(regressions)} regressions against {args.compare}:{Colors.RESET}")
+            for size, stage, before, after in regressions:
+                print(f"  {Colors.RED}{size:>9} lines  {stage:<11} {before:.4f}s -> {after:.4f}s{Colors.RESET}")
+            return 1
+        print(f"\n{Colors.GREEN}No regressions against {args.compare}{Colors.RESET}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
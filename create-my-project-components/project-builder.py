@@ -1,21 +1,117 @@
-# version 1.1.0
+# version 1.2.0
 # Changelog: added variable "ignore_directories", which will not be part of the printed project tree
+# Changelog: parent resolution in parse_structure_file is now a single linear pass
+# Changelog: the parsed structure is cached (in memory and in a sidecar file) and only reparsed when the file changes
+# Changelog: create_project_structure creates in parallel, with exclusive-create files, and reports created/skipped counts
+# Changelog: print_tree walks with scandir, supports depth/entry limits and glob patterns, and summarises collapsed directories
+# Changelog: added plan mode (menu p), a single-snapshot diff of project-structure against the disk that create and cleanup reuse
+# Changelog: added a non-interactive command line (paths/plan/create) and a library API (parse/plan/apply/scaffold); imports are lazy
+# Changelog: files can be seeded from templates ("name <- source" copies, "name <= source" hardlinks), cloned with kernel fast paths
+# Changelog: cleanup walks once, deletes bottom-up relative to directory fds, in parallel, and reports failures at the end
+# Changelog: added watch mode (menu w), which reparses only the edited lines and creates only the new paths on every save
+# Changelog: added the export subcommand, streaming the structure into a tar/tgz/zip archive without touching the disk
+# Changelog: added --profile and --profile-json, timing spans around the parse stages and operations plus syscall counters
 
 import os
-import sys
-from pathlib import Path
-from typing import Dict, List, Tuple
 import re
-from pprint import pprint
-from time import sleep
-from shutil import rmtree 
+import sys
+import errno
+# everything else is imported where it is used, so that starting the script stays cheap
+# when it is called thousands of times from CI (re is the exception: the parser needs it on every line)
 
 restart_quickness = 0.1
 restart_dots = 6
 debugger_mode=False
-ignore_directories = ["__pycache__", ".git", ".vscode", ".idea", ".DS_Store"]
+watch_poll_interval = 0.5 # seconds between checks of the structure file when inotify is not available
+cleanup_workers = 8 # threads for deleting independent subtrees
+creation_workers = 16 # threads for creating files and directories; network and overlay filesystems like plenty of them
+structure_cache_file = ".project-structure.cache" # sidecar holding the last parse, so a restart starts warm
+ignore_directories = ["__pycache__", ".git", ".vscode", ".idea", ".DS_Store", structure_cache_file] # glob patterns are fine too
+collapse_directories = ["node_modules", ".venv", "venv", "build", "dist", "target"] # printed with a summary count, not listed
+builder_files = ["project-structure", "project-builder.py"] # never reported as extra, never deleted
+tree_max_depth = 0 # deepest level the printed tree descends to, 0 for no limit
+tree_max_entries = 200 # entries listed per directory before the rest are summarised, 0 for no limit
+structure_cache_version = 2 # bump whenever parse_structure_file's output changes shape
+_structure_cache = {} # in-memory copy of the last parse, see load_structure()
+profiling = False # turned on by --profile / --profile-json; while off, span() and count() cost one check each
+_profile = {"spans": [], "counters": {}}
 def debug(*args, **kwargs):
     if debugger_mode: print(*args)
+class _NoSpan:
+    def __enter__(self): return self
+    def __exit__(self, *exc_info): return False
+_no_span = _NoSpan()
+class _Span:
+    __slots__ = ("name", "start")
+    def __init__(self, name): self.name = name
+    def __enter__(self):
+        self.start = _profile["clock"]()
+        return self
+    def __exit__(self, *exc_info):
+        end = _profile["clock"]()
+        _profile["spans"].append((self.name, self.start - _profile["started"], end - self.start)) # list.append is atomic
+        return False
+def span(name):
+    """Time a block as a named span while profiling: with span("parse: read"): ..."""
+    return _Span(name) if profiling else _no_span
+def count(name, n=1):
+    """Add n to a named counter (syscalls made, cache hits, ...) while profiling."""
+    if profiling:
+        with _profile["lock"]:
+            _profile["counters"][name] = _profile["counters"].get(name, 0) + n
+def profiled(name):
+    """Decorator recording every call of a function as a span named name while profiling."""
+    def decorate(function):
+        import functools
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiling: return function(*args, **kwargs)
+            with _Span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+def enable_profiling():
+    """Start recording spans and counters from now on."""
+    global profiling
+    import threading
+    import time
+    _profile.update(spans=[], counters={}, lock=threading.Lock(), clock=time.perf_counter, started=time.perf_counter())
+    profiling = True
+def profile_report():
+    """The recorded spans, aggregated by name and sorted by total time, plus counters and wall time."""
+    totals = {}
+    for name, start, seconds in _profile["spans"]:
+        total = totals.setdefault(name, {"name": name, "calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+        total["calls"] += 1
+        total["seconds"] += seconds
+        total["max_seconds"] = max(total["max_seconds"], seconds)
+    return {"wall_seconds": _profile["clock"]() - _profile["started"],
+            "spans": sorted(totals.values(), key=lambda total: total["seconds"], reverse=True),
+            "counters": dict(sorted(_profile["counters"].items())),
+            }
+def print_profile(out=None):
+    """Print the profile breakdown (to stderr by default, so it never mixes with real output)."""
+    out = out or sys.stderr
+    report = profile_report()
+    wall = report["wall_seconds"] or 1e-9
+    print(f"\n{Colors.BOLD}Profile ({report['wall_seconds']:.4f}s wall){Colors.RESET}", file=out)
+    print(f"{Colors.BOLD}{'span':<32} {'calls':>7} {'total s':>10} {'max s':>10} {'% wall':>7}{Colors.RESET}", file=out)
+    for total in report["spans"]:
+        print(f"{total['name']:<32} {total['calls']:>7} {total['seconds']:>10.4f} {total['max_seconds']:>10.4f} "
+              f"{total['seconds'] * 100 / wall:>6.1f}%", file=out) # spans nest and run in threads, so shares can add up past 100
+    if report["counters"]:
+        print(f"{Colors.BOLD}{'counter':<32} {'count':>7}{Colors.RESET}", file=out)
+        for name, value in report["counters"].items():
+            print(f"{name:<32} {value:>7}", file=out)
+def dump_profile(file_path):
+    """Write the aggregated profile and every raw span (name, start offset, seconds) as JSON, for tracking over time."""
+    import json
+    import time
+    report = profile_report()
+    report["timestamp"] = time.time()
+    report["raw_spans"] = [{"name": name, "start": start, "seconds": seconds} for name, start, seconds in _profile["spans"]]
+    with open(file_path, 'w') as f:
+        json.dump(report, f, indent=2)
 class Colors:
     RED = '\033[91m'
     GREEN = '\033[92m'
@@ -30,113 +126,135 @@ class Colors:
 def clear_screen():
     """Clear the terminal screen."""
     os.system('cls' if os.name == 'nt' else 'clear')    
-def parse_structure_file(file_path="project-structure"):
+_template_annotation = re.compile(r'\s+(<-|<=)\s+(\S.*)$') # "name <- source" or "name <= source"
+_art_block = re.compile(r'[^a-zA-Z0-9\s]+')
+def _read_structure_line(line, structure_dir):
+    """Turn one raw line of the project-structure file into its lines_dict entry, or None if it names nothing."""
+    # A file may name a template to seed its content from: "name <- source" copies it, "name <= source" hardlinks it.
+    # Relative sources are taken from the directory holding the project-structure file.
+    if '#' in line: line = line.split('#')[0]
+    line = line.rstrip()
+    template = None
+    annotation = _template_annotation.search(line) if "<-" in line or "<=" in line else None
+    if annotation:
+        line = line[:annotation.start()]
+        template = {"source": os.path.join(structure_dir, annotation.group(2)),
+                    "link": annotation.group(1) == "<=",
+                    }
+    if not line: return None
+    if not (any(char.isalnum() for char in line)): return None # check for atleast one alphanumeric character
+    return {"line": line,
+            "directory": line[-1] == "/",
+            "parent_idx": None,
+            "parent_name": None,
+            "template": None if line[-1] == "/" else template, # directories have no content to seed
+            }
+def _locate_name_and_art(idx, line_info):
+    """Populate a lines_dict entry with positional information about its art and name."""
+    line = line_info["line"]
+    debug(f"[ {idx} ] {line}")
+    # position of alphanumeric character in the line
+    pos_of_filefolder_name = next((i for i, c in enumerate(line) if c.isalnum()), None)
+    debug("position of alphanumeric character in the line:",pos_of_filefolder_name)
+    line_info["pos_of_filefolder_name"] = pos_of_filefolder_name
+
+    # length of the alphanumeric block in the line
+    length_of_filefolder_name = len(line)-pos_of_filefolder_name
+    debug("Length of folder/filename:", length_of_filefolder_name)
+    line_info["length_of_filefolder_name"] = length_of_filefolder_name
+
+    # position of the non-alphanumeric non-space character in the line closest to the alphanumeric character
+    # we need to move leftwards from the position of the alphanumeric character
+    # and find the first non-alphanumeric non-space character
+    # and the first space after this character
+
+    pos_of_art = -1 # a default value for when we don't find any art. Banksy, where are you?
+    if idx == 1: return # first line is the root directory
+    closest_space_discovered_flag = 0
+    closest_art_discovered_flag = 0
+    for i in range(pos_of_filefolder_name,-1,-1):
+        if line[i] == " " and closest_space_discovered_flag == 0:
+            debug('closest_space_discovered_flag triggered at pos:', i)
+            closest_space_discovered_flag = 1
+            continue # the first space preceeding the alphanumeric character
+        if not (line[i].isalnum()) and line[i] != " " and closest_art_discovered_flag == 0:
+            debug('closest_art_discovered_flag triggered at pos:', i)  
+            closest_art_discovered_flag = 1 # now we have a space and art discovered. Time to look for the next space
+        if line[i] == " " and closest_space_discovered_flag == 1 and closest_art_discovered_flag == 1:
+            pos_of_art = i+1
+            break
+        if i == 0 and closest_space_discovered_flag == 1 and closest_art_discovered_flag == 1:
+            pos_of_art = 0 # we found both flags but no space before the art. So the art is at the beginning of the line
+            break
+
+    debug("position of closest ASCII art:",pos_of_art)
+    line_info["pos_of_art"] = pos_of_art
+
+    # total number of contiguous blocks of non-alphanumeric non-space characters to the left of the first alphanumeric character
+    number_of_art_blocks = len(_art_block.findall(line[:pos_of_filefolder_name]))
+    debug("number of distinct ASCII art:", number_of_art_blocks); debug("")
+    line_info["number_of_art_blocks"] = number_of_art_blocks
+def parse_structure_file(file_path="project-structure", raw_lines=None):
     """
     Parse the project-structure file into a hierarchical dictionary and return a dictionary of heirarchy information.
+    raw_lines, if given, are used in place of reading the file again.
     """  
     # PART 1: Check if the project-structure file exists. 
-    if not os.path.isfile(file_path):
+    if raw_lines is None and not os.path.isfile(file_path):
         print(f"{Colors.RED}{file_path} not found. Exiting program.{Colors.RESET}")
         sys.exit(1)
 
     # PART 2: Read the project-structure file    
-    with open(file_path, 'r') as f:
+    structure_dir = os.path.dirname(os.path.abspath(file_path))
+    with span("parse: read lines"):
+        if raw_lines is None:
+            with open(file_path, 'r') as f:
+                raw_lines = f.readlines()
         lines_dict = {}
-        for idx, line in enumerate(f.readlines(),start=1):
-            if '#' in line: line = line.split('#')[0]
-            line = line.rstrip()
-            if not line: continue
-            if not (any(char.isalnum() for char in line)): continue # check for atleast one alphanumeric character
-            lines_dict[idx] = {"line": line,
-                            "directory": line[-1] == "/",
-                            "parent_idx": None,
-                            "parent_name": None,
-                                }
+        for idx, line in enumerate(raw_lines,start=1):
+            line_info = _read_structure_line(line, structure_dir)
+            if line_info: lines_dict[idx] = line_info
 
     # There may be multiple | characters in a line, so we need to find the one closest to the name of the file/directory
-    # And we need to go bottoms up, trying to find the parent of each line 
     
     # PART 3: The first loop    
-    for idx in range(max(lines_dict.keys()),0,-1): # populating lines_dict with positional information about art and names
-        line = lines_dict.get(idx)
-        if not line: continue
-        line = line["line"]
-        ["line"]
-        debug(f"[ {idx} ] {line}")
-        # position of alphanumeric character in the line
-        pos_of_filefolder_name = next((i for i, c in enumerate(line) if c.isalnum()), None)
-        debug("position of alphanumeric character in the line:",pos_of_filefolder_name)
-        lines_dict[idx]["pos_of_filefolder_name"] = pos_of_filefolder_name
-
-        # length of the alphanumeric block in the line
-        length_of_filefolder_name = len(line)-pos_of_filefolder_name
-        debug("Length of folder/filename:", length_of_filefolder_name)
-        lines_dict[idx]["length_of_filefolder_name"] = length_of_filefolder_name
-
-        # position of the non-alphanumeric non-space character in the line closest to the alphanumeric character
-        # we need to move leftwards from the position of the alphanumeric character
-        # and find the first non-alphanumeric non-space character
-        # and the first space after this character
-
-        pos_of_art = -1 # a default value for when we don't find any art. Banksy, where are you?
-        if idx == 1: continue # first line is the root directory
-        closest_space_discovered_flag = 0
-        closest_art_discovered_flag = 0
-        for i in range(pos_of_filefolder_name,-1,-1):
-            if line[i] == " " and closest_space_discovered_flag == 0:
-                debug('closest_space_discovered_flag triggered at pos:', i)
-                closest_space_discovered_flag = 1
-                continue # the first space preceeding the alphanumeric character
-            if not (line[i].isalnum()) and line[i] != " " and closest_art_discovered_flag == 0:
-                debug('closest_art_discovered_flag triggered at pos:', i)  
-                closest_art_discovered_flag = 1 # now we have a space and art discovered. Time to look for the next space
-            if line[i] == " " and closest_space_discovered_flag == 1 and closest_art_discovered_flag == 1:
-                pos_of_art = i+1
-                break
-            if i == 0 and closest_space_discovered_flag == 1 and closest_art_discovered_flag == 1:
-                pos_of_art = 0 # we found both flags but no space before the art. So the art is at the beginning of the line
-                break
-
-        debug("position of closest ASCII art:",pos_of_art)
-        lines_dict[idx]["pos_of_art"] = pos_of_art
+    with span("parse: locate names"):
+        for idx in range(max(lines_dict.keys()),0,-1): # populating lines_dict with positional information about art and names
+            if idx in lines_dict: _locate_name_and_art(idx, lines_dict[idx])
 
-        # total number of contiguous blocks of non-alphanumeric non-space characters to the left of the first alphanumeric character
-        number_of_art_blocks = len(re.findall(r'[^a-zA-Z0-9\s]+', line[:pos_of_filefolder_name]))
-        debug("number of distinct ASCII art:", number_of_art_blocks); debug("")
-        lines_dict[idx]["number_of_art_blocks"] = number_of_art_blocks
-
-        # is the position of the non-alphanumeric non-space character in the line closest to the alphanumeric character
-        # within the extent of the alphanumeric block in the line immediately above
-
-    # PART 4 The parent-searcher nested loops
-    for idx in range(max(lines_dict.keys()),0,-1): # finding the parent
-        if idx == 1: continue # first line is the root directory
-        # if the line is not a child, then continue
-        if not lines_dict.get(idx): continue        
-        debug("")
-        debug(f"[ {idx} ]: {idx}")
-        debug(f"childname:", lines_dict.get(idx)['line'][lines_dict.get(idx)['pos_of_filefolder_name']:])
-        debug("pos_of_art", lines_dict.get(idx)["pos_of_art"])
-        debug("pos_of_filefolder_name", lines_dict.get(idx)["pos_of_filefolder_name"])
-        debug("length_of_filefolder_name", lines_dict.get(idx)["length_of_filefolder_name"])
-        # we need to loop through the lines above this line till we find a parent
-        pos_of_art = lines_dict.get(idx)["pos_of_art"] # position of art for the child
-        for idx_above in range(idx-1,0,-1):
-            # if the line above is not a parent, then continue
-            if not lines_dict.get(idx_above): continue
-            pos_of_parent_filefolder_name = lines_dict.get(idx_above)["pos_of_filefolder_name"]
-            length_of_parent_filefolder_name = lines_dict.get(idx_above)["length_of_filefolder_name"]
-            debug(f"checking line {idx_above} for parent")
-            # if art for the child line hits the alphanumeric for the plausible parent, then bingo, we have it 
-            if pos_of_art >= pos_of_parent_filefolder_name and pos_of_art <= (pos_of_parent_filefolder_name + length_of_parent_filefolder_name):
-                parent_name = lines_dict.get(idx_above)['line'][lines_dict.get(idx_above)['pos_of_filefolder_name']:]
-                debug("found parent at line", idx_above)
-                debug("Parent's name:", parent_name)
-                lines_dict[idx]["parent_idx"] = idx_above
-                lines_dict[idx]["parent_name"] = parent_name
-                break
+    # PART 4 The parent resolver, a single top-down pass
+    # A child's parent is the nearest line above whose name block spans the child's art column.
+    # Instead of scanning upwards for every line, we keep the latest line that "owns" each column
+    # (the open ancestor for that column). Every line stakes its claim over the columns of its name
+    # block once it has been resolved, so each line costs one lookup plus one slice assignment,
+    # and the whole pass is linear in the size of the file.
+    with span("parse: resolve parents"):
+        open_ancestors = [] # column -> idx of the nearest line above whose name block covers that column
+        for idx in sorted(lines_dict.keys()): # finding the parent
+            line_info = lines_dict[idx]
+            pos_of_filefolder_name = line_info["pos_of_filefolder_name"]
+            name_end = pos_of_filefolder_name + line_info["length_of_filefolder_name"]
+            if idx != 1: # first line is the root directory
+                pos_of_art = line_info["pos_of_art"] # position of art for the child
+                debug("")
+                debug(f"[ {idx} ]: {idx}")
+                debug(f"childname:", line_info['line'][pos_of_filefolder_name:])
+                debug("pos_of_art", pos_of_art)
+                # if art for the child line hits the alphanumeric of an open ancestor, then bingo, we have it
+                if 0 <= pos_of_art < len(open_ancestors) and open_ancestors[pos_of_art] is not None:
+                    idx_above = open_ancestors[pos_of_art]
+                    parent_name = lines_dict[idx_above]['line'][lines_dict[idx_above]['pos_of_filefolder_name']:]
+                    debug("found parent at line", idx_above)
+                    debug("Parent's name:", parent_name)
+                    line_info["parent_idx"] = idx_above
+                    line_info["parent_name"] = parent_name
+            # this line now covers its own name block (inclusive of the column just past the name)
+            if len(open_ancestors) <= name_end:
+                open_ancestors.extend([None] * (name_end + 1 - len(open_ancestors)))
+            open_ancestors[pos_of_filefolder_name:name_end + 1] = [idx] * (name_end + 1 - pos_of_filefolder_name)
 
     return lines_dict
+@profiled("generate_paths")
 def generate_paths(lines_dict):
     """Analyze the paths and create a linear string for each path."""
     project_structure_paths = []
@@ -162,101 +280,963 @@ def generate_paths(lines_dict):
     project_structure_paths = [path.replace(root_path, "./") for path in project_structure_paths]
     project_structure_paths = project_structure_paths[1:] # removing the root directory from the list
     return project_structure_paths
-def create_project_structure(project_structure_paths):
-    """Create the project structure based on the parsed paths."""
-    updated_any = False
-    for path in project_structure_paths:
-        try:
-            if path.endswith("/"):
-                # Directory
-                if not os.path.isdir(path):
-                    os.makedirs(path, exist_ok=True)
-                    updated_any = True
+def _path_of(line_info, parent_path):
+    """The path of a line in generate_paths format, given the path of its parent (None when it has none)."""
+    name = line_info["line"][line_info["pos_of_filefolder_name"]:]
+    if parent_path is None: return name
+    return parent_path + ("" if parent_path.endswith("/") else "/") + name
+def _watch_state(file_path, raw_lines):
+    """Fully parse the structure, keeping what incremental updates need: the raw lines and every line's path."""
+    from collections import Counter
+    lines_dict = parse_structure_file(file_path, raw_lines)
+    paths_by_idx = {}
+    for idx, line_info in lines_dict.items():
+        parent_idx = line_info["parent_idx"]
+        paths_by_idx[idx] = "./" if idx == 1 else _path_of(line_info, paths_by_idx[parent_idx] if parent_idx else None)
+    return {"file_path": file_path,
+            "raw": raw_lines,
+            "lines_dict": lines_dict,
+            "paths_by_idx": paths_by_idx,
+            "path_counts": Counter(path for idx, path in paths_by_idx.items() if idx != 1),
+            }
+@profiled("update_structure_incrementally")
+def update_structure_incrementally(state, raw_lines):
+    """
+    Bring a watch state up to date with the new content of the structure file.
+    Only the lines between the unchanged head and tail of the file are parsed again, and parents are
+    re-resolved only for those lines and for the lines below them whose parent search crossed them.
+    Paths are recomputed only where a parent, or a parent's path, has changed.
+    Returns (added, removed): paths that are new to the structure, and paths that left it.
+    """
+    old_raw, old_dict, old_paths = state["raw"], state["lines_dict"], state["paths_by_idx"]
+    old_count, new_count = len(old_raw), len(raw_lines)
+    head, limit = 0, min(old_count, new_count)
+    while head < limit and old_raw[head] == raw_lines[head]: head += 1
+    if head == old_count == new_count:
+        return [], []
+    tail = 0
+    while tail < limit - head and old_raw[old_count - 1 - tail] == raw_lines[new_count - 1 - tail]: tail += 1
+    if head == 0 or 1 not in old_dict: # the root line changed, so everything did
+        old_set = set(state["path_counts"])
+        state.update(_watch_state(state["file_path"], raw_lines))
+        return ([path for path in state["path_counts"] if path not in old_set],
+                [path for path in old_set if path not in state["path_counts"]])
+    old_end, new_end = old_count - tail, new_count - tail # the changed lines are head+1..old_end, now head+1..new_end
+    shift = new_count - old_count
+    structure_dir = os.path.dirname(os.path.abspath(state["file_path"]))
+
+    prefix_owners = {} # column -> nearest unchanged line above the changed lines covering it, found on demand
+    def prefix_owner(column):
+        if column not in prefix_owners:
+            prefix_owners[column] = None
+            for idx in range(head, 0, -1):
+                line_info = old_dict.get(idx)
+                if line_info and line_info["pos_of_filefolder_name"] <= column <= line_info["pos_of_filefolder_name"] + line_info["length_of_filefolder_name"]:
+                    prefix_owners[column] = idx
+                    break
+        return prefix_owners[column]
+    def set_parent(line_info, parent_idx, lines_dict):
+        line_info["parent_idx"] = parent_idx
+        line_info["parent_name"] = None if parent_idx is None else lines_dict[parent_idx]["line"][lines_dict[parent_idx]["pos_of_filefolder_name"]:]
+
+    # the unchanged head keeps everything it had
+    lines_dict, paths_by_idx = {}, {}
+    for idx in range(1, head + 1):
+        if idx in old_dict:
+            lines_dict[idx] = old_dict[idx]
+            paths_by_idx[idx] = old_paths[idx]
+    changed = [] # line numbers (new) whose path may have changed
+    # the changed lines, parsed and resolved top-down with the same column ownership as PART 4
+    region_owners = {}
+    for idx in range(head + 1, new_end + 1):
+        line_info = _read_structure_line(raw_lines[idx - 1], structure_dir)
+        if not line_info: continue
+        _locate_name_and_art(idx, line_info)
+        lines_dict[idx] = line_info
+        column = line_info["pos_of_art"]
+        parent_idx = region_owners.get(column) if column >= 0 else None
+        if parent_idx is None and column >= 0:
+            parent_idx = prefix_owner(column)
+        set_parent(line_info, parent_idx, lines_dict)
+        paths_by_idx[idx] = _path_of(line_info, paths_by_idx[parent_idx] if parent_idx else None)
+        changed.append(idx)
+        pos_of_filefolder_name = line_info["pos_of_filefolder_name"]
+        for column in range(pos_of_filefolder_name, pos_of_filefolder_name + line_info["length_of_filefolder_name"] + 1):
+            region_owners[column] = idx
+    # the unchanged tail moves by shift; only lines whose parent search reached the changed lines are resolved again
+    dirty = set(changed)
+    for old_idx in range(old_end + 1, old_count + 1):
+        old_info = old_dict.get(old_idx)
+        if not old_info: continue
+        idx = old_idx + shift
+        line_info = dict(old_info)
+        lines_dict[idx] = line_info
+        old_parent, column = old_info["parent_idx"], old_info["pos_of_art"]
+        if old_parent is not None and old_parent > old_end:
+            parent_idx = old_parent + shift # found within the tail, the changed lines were never looked at
+        else:
+            parent_idx = region_owners.get(column) if column >= 0 else None
+            if parent_idx is None:
+                if old_parent is None or old_parent <= head:
+                    parent_idx = old_parent # the changed lines do not cover it, so the old answer stands
                 else:
-                    debug(f"Directory already exists: {path} ... skipping")
+                    parent_idx = prefix_owner(column) # the old parent was among the changed lines
+        moved = old_parent is None and parent_idx is not None or old_parent is not None and (
+            parent_idx != (old_parent + shift if old_parent > old_end else old_parent))
+        set_parent(line_info, parent_idx, lines_dict)
+        if moved or parent_idx in dirty:
+            paths_by_idx[idx] = _path_of(line_info, paths_by_idx[parent_idx] if parent_idx else None)
+            dirty.add(idx)
+            changed.append(idx)
+        else:
+            paths_by_idx[idx] = old_paths[old_idx]
 
-            else:
-                # File
-                try:
-                    f = open(path, "r")
-                    debug(f"File already exists: {path} ... skipping")
-                    f.close()
-                except FileNotFoundError:
-                    with open(path, "w") as f:
-                        f.write("")
-                        updated_any = True
-        except Exception as e:
-            debug(f"{Colors.RED}Error creating {path}: {str(e)}{Colors.RESET}")
+    # keep a count of every path, to tell new paths from ones already in the structure
+    path_counts = state["path_counts"]
+    old_changed = [old_paths[idx] for idx in range(head + 1, old_end + 1) if idx in old_dict]
+    old_changed += [old_paths[idx - shift] for idx in changed if idx > new_end]
+    new_changed = [paths_by_idx[idx] for idx in changed]
+    before = {path: path_counts[path] for path in set(old_changed) | set(new_changed)}
+    for path in old_changed:
+        path_counts[path] -= 1
+    for path in new_changed:
+        path_counts[path] += 1
+    added = [path for path in dict.fromkeys(new_changed) if before[path] <= 0 < path_counts[path]]
+    removed = [path for path in dict.fromkeys(old_changed) if path_counts[path] <= 0 < before[path]]
+    for path in before:
+        if path_counts[path] <= 0: del path_counts[path]
+    state.update(raw=raw_lines, lines_dict=lines_dict, paths_by_idx=paths_by_idx)
+    return added, removed
+def _structure_change_waiter(file_path):
+    """
+    Return (wait, close): wait(timeout) blocks until the structure file may have been saved (True) or timeout
+    passes (False), close() releases what the waiting holds.
+    Uses inotify on the file's directory where available (editors often save by renaming), polling the file's stat otherwise.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    inotify_fd = -1
+    try:
+        import ctypes
+        import ctypes.util
+        import select
+        import struct
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        inotify_fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        IN_CLOSE_WRITE, IN_MOVED_TO = 0x8, 0x80
+        if inotify_fd < 0 or libc.inotify_add_watch(inotify_fd, directory.encode(), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            raise OSError(ctypes.get_errno(), "inotify unavailable")
+        def wait(timeout):
+            touched = False
+            while select.select([inotify_fd], [], [], timeout)[0]:
+                data = os.read(inotify_fd, 65536)
+                offset = 0
+                while offset < len(data): # struct inotify_event: wd, mask, cookie, len, then the name
+                    _, _, _, length = struct.unpack_from("iIII", data, offset)
+                    event_name = data[offset + 16:offset + 16 + length].rstrip(b"\0").decode(errors="replace")
+                    touched = touched or event_name == name
+                    offset += 16 + length
+                timeout = 0.05 # gather the burst of events a single save can make
+            return touched
+        debug("watching with inotify")
+        return wait, lambda: os.close(inotify_fd) # closing the fd drops its watch too
+    except (OSError, AttributeError):
+        if inotify_fd >= 0: os.close(inotify_fd)
+        debug("inotify unavailable, polling")
+    last = [None]
+    def wait(timeout):
+        from time import sleep
+        sleep(min(timeout, watch_poll_interval))
+        try:
+            stat = os.stat(file_path)
+            key = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return False
+        touched, last[0] = last[0] is not None and key != last[0], key
+        return touched
+    wait(0)
+    return wait, lambda: None
+def watch_structure(file_path="project-structure", root="."):
+    """
+    Create the structure under root, then keep watching the structure file: on every save, reparse only
+    what changed and create only the paths that are new. Removed entries are reported but left on disk.
+    Runs until interrupted with Ctrl-C.
+    """
+    from time import strftime
+    def read_lines():
+        with open(file_path, 'r') as f:
+            return f.readlines()
+    os.makedirs(root, exist_ok=True)
+    wait, close = _structure_change_waiter(file_path)
+    try:
+        state = _watch_state(file_path, read_lines())
+        project_structure_paths = [path for idx, path in state["paths_by_idx"].items() if idx != 1]
+        templates = collect_templates(state["lines_dict"], project_structure_paths)
+        print_creation_summary(create_project_structure(project_structure_paths, root=root, templates=templates,
+                                                        plan=plan_structure(project_structure_paths, root)))
+        print(f"\n{Colors.CYAN}Watching {file_path} for changes, press Ctrl-C to stop.{Colors.RESET}")
+        while True:
+            if not wait(3600): continue
+            try:
+                raw_lines = read_lines()
+                added, removed = update_structure_incrementally(state, raw_lines)
+            except (OSError, ValueError, KeyError, TypeError) as e: # mid-save, or a line that does not parse yet
+                debug(f"{Colors.RED}Could not update from {file_path}: {str(e)}{Colors.RESET}")
+                continue
+            if not added and not removed: continue
+            added_set = set(added)
+            templates = {state["paths_by_idx"][idx]: line_info["template"] for idx, line_info in state["lines_dict"].items()
+                         if line_info.get("template") and state["paths_by_idx"][idx] in added_set}
+            counts = create_project_structure(added, root=root, templates=templates)
+            print(f"[{strftime('%H:%M:%S')}] {Colors.GREEN}+{counts['created_directories']} directories, "
+                  f"+{counts['created_files']} files{Colors.RESET}"
+                  + (f", {Colors.YELLOW}{len(removed)} no longer in {file_path} (left on disk){Colors.RESET}" if removed else "")
+                  + (f", {Colors.RED}{len(counts['errors'])} failed{Colors.RESET}" if counts["errors"] else ""))
+            for path, error in counts["errors"].items():
+                print(f"  {Colors.RED}{path}: {error}{Colors.RESET}")
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Stopped watching {file_path}.{Colors.RESET}")
+    finally:
+        close()
+def collect_templates(lines_dict, project_structure_paths):
+    """Map each path (as from generate_paths) whose line names a template to that template."""
+    line_infos = list(lines_dict.values())[1:] # generate_paths drops the root line too
+    return {path: line_info["template"] for line_info, path in zip(line_infos, project_structure_paths)
+            if line_info.get("template")}
+def _read_structure_cache(cache_path):
+    """Read the sidecar cache file, returning None if it is missing or unreadable."""
+    import json
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        # json turns the integer line numbers into strings, so we bring them back
+        cached["lines_dict"] = {int(idx): info for idx, info in cached["lines_dict"].items()}
+        return cached
+    except (OSError, ValueError, KeyError, AttributeError):
+        return None
+def _write_structure_cache(cache_path, cached):
+    """Write the sidecar cache file atomically. A failure here only costs us a warm restart."""
+    import json
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(cached, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        debug(f"{Colors.RED}Could not write {cache_path}: {str(e)}{Colors.RESET}")
+        try: os.remove(tmp_path)
+        except OSError: pass
+@profiled("load_structure")
+def load_structure(file_path="project-structure", cache_path=structure_cache_file):
+    """
+    Return (lines_dict, project_structure_paths) for the project-structure file, parsing it only when it has really changed.
+    The cache is keyed on the file's mtime and size, and on a hash of its content when those two have moved.
+    The directory holding the file is part of the key too, since template sources are resolved against it.
+    With cache_path set to None the sidecar file is neither read nor written.
+    """
+    import hashlib
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return parse_structure_file(file_path), [] # parse_structure_file reports the missing file and exits
+    structure_dir = os.path.dirname(os.path.abspath(file_path))
+    stat_key = [stat.st_mtime_ns, stat.st_size, structure_dir]
 
-    if updated_any:
-        project_structure_action = "updated"
+    # cheapest check first: nothing about the file has changed since we last looked
+    cached = _structure_cache.get(file_path)
+    if cached and cached["stat_key"] == stat_key:
+        debug(f"{file_path} unchanged, using cached parse")
+        count("structure cache: hit")
+        return cached["lines_dict"], cached["paths"]
+
+    # the file was touched or is new to us, so the content hash decides
+    with open(file_path, 'rb') as f:
+        content_hash = hashlib.sha256(f.read()).hexdigest()
+    if not cached and cache_path:
+        cached = _read_structure_cache(cache_path) # warm start after a restart
+    if (cached and cached.get("content_hash") == content_hash and cached.get("version") == structure_cache_version
+            and cached.get("structure_dir") == structure_dir):
+        debug(f"{file_path} content unchanged, using cached parse")
+        count("structure cache: hit")
     else:
-        project_structure_action = "no changes made"
-            
-    return project_structure_action        
-def cleanup_project_structure(project_structure_paths, forceful=False):
-    """Cleanup the project structure based on the parsed paths."""
-    directories_to_remove = []
+        debug(f"{file_path} changed, parsing")
+        count("structure cache: miss")
+        lines_dict = parse_structure_file(file_path)
+        cached = {"version": structure_cache_version,
+                  "content_hash": content_hash,
+                  "structure_dir": structure_dir,
+                  "lines_dict": lines_dict,
+                  "paths": generate_paths(lines_dict),
+                  }
+    cached["stat_key"] = stat_key
+    _structure_cache[file_path] = cached
+    if cache_path:
+        _write_structure_cache(cache_path, cached)
+    return cached["lines_dict"], cached["paths"]
+def _creation_order(project_structure_paths):
+    """
+    Split the parsed paths into directories and files, relative to the project root.
+    Directories are deduplicated, any parent that was not listed explicitly is added, and they are
+    grouped by depth so that every directory is created after its parent.
+    """
+    directories = set()
+    files = []
+    for path in project_structure_paths:
+        relative_path = os.path.normpath(path)
+        if relative_path in (".", ""): continue
+        if path.endswith("/"):
+            directories.add(relative_path)
+        else:
+            files.append(relative_path)
+        parent = os.path.dirname(relative_path)
+        while parent and parent not in directories:
+            directories.add(parent)
+            parent = os.path.dirname(parent)
+    waves = {}
+    for directory in directories:
+        waves.setdefault(directory.count(os.sep), []).append(directory)
+    return [sorted(waves[depth]) for depth in sorted(waves)], list(dict.fromkeys(files))
+def _already_there(path, directory):
+    """After EEXIST: False if path already is the kind of entry wanted, else raise saying what is in the way."""
+    if os.path.isdir(path) != directory:
+        raise FileExistsError(errno.EEXIST, "a " + ("file" if directory else "directory") + " is in the way", path)
+    return False
+def _create_directory(path):
+    """Create one directory, whose parent is known to exist. Returns True if created, False if already there."""
+    count("syscall: mkdir")
     try:
-        for path in project_structure_paths:
-            if os.path.isdir(path):
-                directories_to_remove.append(path)    
+        os.mkdir(path)
+        return True
+    except FileExistsError:
+        return _already_there(path, directory=True)
+def _clone_into(source_fd, target_fd):
+    """
+    Copy a template's content between two open files using the cheapest route the kernel offers:
+    a reflink (shared extents, no data copied), then copy_file_range, then sendfile, then read/write.
+    """
+    try:
+        import fcntl
+        count("syscall: ioctl FICLONE")
+        fcntl.ioctl(target_fd, 0x40049409, source_fd) # FICLONE, on btrfs, xfs, and friends
+        return
+    except (ImportError, OSError):
+        pass
+    size = os.fstat(source_fd).st_size
+    copied = 0
+    try:
+        while copied < size:
+            count("syscall: copy_file_range")
+            sent = os.copy_file_range(source_fd, target_fd, size - copied, copied, copied)
+            if not sent: break
+            copied += sent
+        if copied >= size: return
+    except (AttributeError, OSError):
+        pass
+    try:
+        while copied < size:
+            os.lseek(target_fd, copied, os.SEEK_SET)
+            count("syscall: sendfile")
+            sent = os.sendfile(target_fd, source_fd, copied, size - copied)
+            if not sent: break
+            copied += sent
+        if copied >= size: return
+    except (AttributeError, OSError):
+        pass
+    os.lseek(source_fd, copied, os.SEEK_SET)
+    os.lseek(target_fd, copied, os.SEEK_SET)
+    while True:
+        count("syscall: read/write")
+        chunk = os.read(source_fd, 1 << 20)
+        if not chunk: break
+        while chunk:
+            chunk = chunk[os.write(target_fd, chunk):]
+def _create_file(path, template=None):
+    """
+    Create one file with exclusive-create semantics, never touching an existing file
+    (an existing directory in its place is an error, not a skip).
+    Without a template the file is left empty; with one it is hardlinked to the template
+    (where asked for and possible) or has the template's content cloned into it.
+    """
+    if template and template["link"]:
+        count("syscall: link")
+        try:
+            os.link(template["source"], path)
+            return True
+        except FileExistsError:
+            return _already_there(path, directory=False)
+        except OSError as e:
+            debug(f"Cannot hardlink {template['source']} ({str(e)}), copying instead")
+    source_fd = os.open(template["source"], os.O_RDONLY) if template else None
+    count("syscall: open", 2 if template else 1)
+    try:
+        try:
+            target_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0), 0o666)
+        except FileExistsError:
+            return _already_there(path, directory=False)
+        try:
+            if source_fd is not None:
+                _clone_into(source_fd, target_fd)
+        except OSError:
+            os.close(target_fd)
+            os.remove(path) # no half-seeded files left behind
+            raise
+        os.close(target_fd)
+        return True
+    finally:
+        if source_fd is not None: os.close(source_fd)
+def _parallel(function, items, workers):
+    """Map function over items across a thread pool of up to workers threads (inline when there is nothing to gain)."""
+    if workers > 1 and len(items) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+            return list(pool.map(function, items))
+    return list(map(function, items))
+def _run_in_pool(function, paths, workers, counts, kind):
+    """Apply function to every (root-relative) path across a thread pool, tallying the outcome into counts."""
+    def attempt(path):
+        try:
+            return path, function(path), None
+        except OSError as e:
+            return path, None, e
+    for path, created, error in _parallel(attempt, paths, workers):
+        if error is not None:
+            debug(f"{Colors.RED}Error creating {path}: {str(error)}{Colors.RESET}")
+            counts["errors"][path] = str(error)
+        elif created:
+            counts[f"created_{kind}"] += 1
+        else:
+            debug(f"{kind[:-1].capitalize()} already exists: {path} ... skipping")
+            counts[f"skipped_{kind}"] += 1
+def _structure_path(relative_path, kind):
+    """Turn a root-relative path back into the generate_paths format, e.g. ./src/ for a directory."""
+    return "./" + relative_path + ("/" if kind == "d" else "")
+@profiled("snapshot_tree")
+def snapshot_tree(root=".", descend=None):
+    """
+    Take one scandir snapshot under root: a dict of root-relative path -> "d" or "f".
+    Only directories for which descend(relative_path) is true are looked into, so a plan never
+    wanders into directories the structure knows nothing about. Symlinks are never followed.
+    """
+    snapshot = {}
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop()
+        try:
+            count("syscall: scandir")
+            with os.scandir(os.path.join(root, relative_dir) if relative_dir else root) as it:
+                for entry in it:
+                    relative_path = os.path.join(relative_dir, entry.name) if relative_dir else entry.name
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    snapshot[relative_path] = "d" if is_dir else "f"
+                    if is_dir and not entry.is_symlink() and (descend is None or descend(relative_path)):
+                        pending.append(relative_path)
+        except OSError as e:
+            debug(f"{Colors.RED}Error scanning {relative_dir or root}: {str(e)}{Colors.RESET}")
+    return snapshot
+@profiled("plan_structure")
+def plan_structure(project_structure_paths, root="."):
+    """
+    Diff the parsed paths against what is on disk under root, from a single snapshot.
+    Returns a dict of lists of paths (in generate_paths format):
+      missing:    in the structure, not on disk
+      present:    in the structure and on disk, as the right type
+      mismatched: in the structure, but on disk as the other type (a file where a directory belongs, or vice versa)
+      extra:      on disk inside the structure's directories, but not in the structure (topmost entries only)
+    """
+    directory_waves, files = _creation_order(project_structure_paths)
+    expected = {path: "d" for wave in directory_waves for path in wave}
+    expected.update((path, "f") for path in files)
+    snapshot = snapshot_tree(root, descend=lambda path: expected.get(path) == "d")
+    plan = {"missing": [], "present": [], "mismatched": [], "extra": []}
+    for wave in directory_waves + [files]: # parents before children, so the plan can be applied in order
+        for path in wave:
+            kind, actual_kind = expected[path], snapshot.get(path)
+            if actual_kind is None:
+                plan["missing"].append(_structure_path(path, kind))
+            elif actual_kind == kind:
+                plan["present"].append(_structure_path(path, kind))
             else:
-                os.remove(path)
-    except Exception as e:
-        debug(f"{Colors.RED}Error deleting {path}: {str(e)}{Colors.RESET}")
-    # now that all files are deleted, we need to remove the directories        
-   
-    directories_to_remove = sorted(directories_to_remove, key=len, reverse=True) # sort by length to remove inner directories first
-    for path in directories_to_remove:
+                plan["mismatched"].append(_structure_path(path, kind))
+    ignored = _name_matcher(ignore_directories + builder_files)
+    for path, actual_kind in sorted(snapshot.items()):
+        if path in expected: continue
+        if os.sep not in path and ignored(path): continue # our own files at the project root
+        plan["extra"].append(_structure_path(path, actual_kind))
+    return plan
+def print_plan(plan):
+    """Print the outcome of plan_structure, a dry run of create and cleanup."""
+    sections = [("missing", Colors.GREEN, "would be created"),
+                ("mismatched", Colors.RED, "exist as the wrong type, create will fail on these"),
+                ("extra", Colors.MAGENTA, "are not in project-structure"),
+                ]
+    print(f"{Colors.BOLD}Plan:{Colors.RESET} {len(plan['present'])} present, {len(plan['missing'])} missing, "
+          f"{len(plan['mismatched'])} mismatched, {len(plan['extra'])} extra")
+    for key, color, meaning in sections:
+        if not plan[key]: continue
+        print(f"\n{Colors.BOLD}{key.capitalize()}{Colors.RESET} ({meaning}):")
+        for path in plan[key]:
+            print(f"  {color}{path}{Colors.RESET}")
+@profiled("create_project_structure")
+def create_project_structure(project_structure_paths, root=".", workers=None, plan=None, templates=None):
+    """
+    Create the project structure based on the parsed paths, under root.
+    Directories are created level by level and files with a single exclusive-create open each,
+    both spread across a thread pool. With a plan from plan_structure, only the missing entries
+    are attempted. Files found in templates (see collect_templates) are seeded from their template.
+    Returns counts of what was created and skipped.
+    """
+    workers = workers or creation_workers
+    counts = {"created_directories": 0, "skipped_directories": 0,
+              "created_files": 0, "skipped_files": 0,
+              "errors": {}, # path -> error message
+              }
+    if plan is not None:
+        for path in plan["present"]:
+            counts["skipped_directories" if path.endswith("/") else "skipped_files"] += 1
+        for path in plan["mismatched"]:
+            counts["errors"][os.path.normpath(path)] = "a " + ("file" if path.endswith("/") else "directory") + " is in the way"
+        project_structure_paths = plan["missing"]
+    directory_waves, files = _creation_order(project_structure_paths)
+    if plan is not None: # the implicit parents _creation_order adds back were already counted (or failed) above
+        accounted = {os.path.normpath(path) for path in plan["present"] + plan["mismatched"]}
+        directory_waves = [wave for wave in ([path for path in wave if path not in accounted] for wave in directory_waves) if wave]
+    templates = {os.path.normpath(path): template for path, template in (templates or {}).items()}
+    with span("create: directories"):
+        for wave in directory_waves: # a wave only starts once its parents exist
+            _run_in_pool(lambda path: _create_directory(os.path.join(root, path)), wave, workers, counts, "directories")
+    with span("create: files"):
+        _run_in_pool(lambda path: _create_file(os.path.join(root, path), templates.get(path)), files, workers, counts, "files")
+    return counts
+def _remove_subtree(root_fd, relative_path, summary):
+    """
+    Delete a directory and everything below it, bottom-up, with every unlink and rmdir relative to
+    an open directory fd rather than a full path. Failures are recorded in summary and skipped.
+    """
+    def record(path, error):
+        summary["errors"][path] = error.strerror or str(error)
+    removed_files, removed_directories = 0, 0
+    walker = os.fwalk(relative_path, topdown=False, dir_fd=root_fd,
+                      onerror=lambda e: record(e.filename or relative_path, e))
+    for dirpath, dirnames, filenames, dirfd in walker:
+        count("syscall: unlink", len(filenames))
+        count("syscall: rmdir", len(dirnames))
+        for name in filenames:
+            try:
+                os.unlink(name, dir_fd=dirfd)
+                removed_files += 1
+            except OSError as e:
+                record(os.path.join(dirpath, name), e)
+        for name in dirnames: # already emptied, we are walking bottom-up
+            try:
+                os.rmdir(name, dir_fd=dirfd)
+                removed_directories += 1
+            except OSError as e:
+                record(os.path.join(dirpath, name), e)
+    try:
+        os.rmdir(relative_path, dir_fd=root_fd)
+        removed_directories += 1
+    except OSError as e:
+        record(relative_path, e)
+    return removed_files, removed_directories
+@profiled("cleanup_project_structure")
+def cleanup_project_structure(project_structure_paths, forceful=False, plan=None, root=".", workers=None):
+    """
+    Cleanup the project structure based on the parsed paths (or on a plan from plan_structure), under root.
+    Files go first, then directories deepest level first; occupied directories are retained.
+    The forceful mode removes everything under root except the builder's own files, walking the tree
+    once and deleting independent top-level subtrees in parallel.
+    Nothing stops on a failure: returns counts plus a dict of path -> error for everything that could not be removed.
+    """
+    workers = workers or cleanup_workers
+    summary = {"removed_files": 0, "removed_directories": 0, "retained_directories": [],
+               "errors": {}, # path -> error message
+               }
+    use_dir_fd = hasattr(os, "fwalk") and os.unlink in os.supports_dir_fd and os.rmdir in os.supports_dir_fd
+    root_fd = os.open(root, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)) if use_dir_fd else None
+    def at(function, relative_path):
+        return function(relative_path, dir_fd=root_fd) if use_dir_fd else function(os.path.join(root, relative_path))
+    def attempt(function, relative_path):
         try:
-            os.rmdir(path)
-        except Exception as e: # manually created files left over
-            debug(f"{Colors.RED}Retaining occupied directory {path}:{Colors.RESET}")
-
-
-    if forceful:
-        for root, dirs, files in os.walk(os.getcwd()):
-                for file in files:
-                    if file not in ["project-structure", "project-builder.py"]:
-                        print(f"{Colors.RED}Forcefully deleting file: {file}{Colors.RESET}")
-                        os.remove(os.path.join(root, file))
-                for dir in dirs:
-                    print(f"{Colors.RED}Forcefully deleting directory {dir}{Colors.RESET}")
-                    rmtree(dir)
+            at(function, relative_path)
+            return relative_path, None
+        except OSError as e:
+            return relative_path, e
+    try:
+        if forceful:
+            with os.scandir(root) as it: # the top level is the only place our own files are kept
+                entries = [entry for entry in it if entry.name not in builder_files]
+            files = [entry.name for entry in entries if not entry.is_dir(follow_symlinks=False)]
+            directories = [entry.name for entry in entries if entry.is_dir(follow_symlinks=False)]
+            for path, error in _parallel(lambda path: attempt(os.unlink, path), files, workers):
+                if error: summary["errors"][path] = error.strerror or str(error)
+                else: summary["removed_files"] += 1
+            if use_dir_fd:
+                removed = _parallel(lambda path: _remove_subtree(root_fd, path, summary), directories, workers)
+                summary["removed_files"] += sum(files for files, _ in removed)
+                summary["removed_directories"] += sum(directories for _, directories in removed)
+            else:
+                from shutil import rmtree
+                def record(function, path, info):
+                    summary["errors"][path] = str(info[1])
+                for path in directories:
+                    failures = len(summary["errors"])
+                    rmtree(os.path.join(root, path), onerror=record)
+                    if len(summary["errors"]) == failures and not os.path.lexists(os.path.join(root, path)):
+                        summary["removed_directories"] += 1 # only subtrees that are really gone
+            return summary
 
+        plan = plan if plan is not None else plan_structure(project_structure_paths, root)
+        # the plan already knows what is on disk, and as what
+        on_disk = plan["present"] + [path.rstrip("/") if path.endswith("/") else path + "/" for path in plan["mismatched"]]
+        files = [os.path.normpath(path) for path in on_disk if not path.endswith("/")]
+        for path, error in _parallel(lambda path: attempt(os.unlink, path), files, workers):
+            if error: summary["errors"][path] = error.strerror or str(error)
+            else: summary["removed_files"] += 1
+        # now that all files are deleted, we remove the directories, inner levels first
+        levels = {}
+        for path in on_disk:
+            if path.endswith("/"):
+                path = os.path.normpath(path)
+                levels.setdefault(path.count(os.sep), []).append(path)
+        for depth in sorted(levels, reverse=True):
+            for path, error in _parallel(lambda path: attempt(os.rmdir, path), levels[depth], workers):
+                if error is None:
+                    summary["removed_directories"] += 1
+                elif isinstance(error, OSError) and error.errno in (errno.ENOTEMPTY, errno.EEXIST):
+                    debug(f"{Colors.RED}Retaining occupied directory {path}{Colors.RESET}") # manually created files left over
+                    summary["retained_directories"].append(path)
+                else:
+                    summary["errors"][path] = error.strerror or str(error)
+        return summary
+    finally:
+        if root_fd is not None: os.close(root_fd)
+def print_cleanup_summary(summary, forceful=False):
+    """Print what cleanup_project_structure did."""
     message = "project-structure based" if not forceful else "FORCEFUL"
-    print(f"{Colors.YELLOW}{message} cleanup complete.{Colors.RESET}")        
-def print_tree(base_path: Path = Path('.'), prefix: str = ""):
-    """Print the directory structure in tree format with colors."""
-    if base_path.name in ignore_directories:
+    print(f"{Colors.YELLOW}{message} cleanup complete.{Colors.RESET}")
+    print(f"  removed:  {Colors.GREEN}{summary['removed_directories']} directories, {summary['removed_files']} files{Colors.RESET}")
+    if summary["retained_directories"]:
+        print(f"  retained: {Colors.YELLOW}{len(summary['retained_directories'])} directories{Colors.RESET} (not empty)")
+    if summary["errors"]:
+        print(f"  {Colors.RED}failed:   {len(summary['errors'])} paths{Colors.RESET}")
+        for path, error in sorted(summary["errors"].items()):
+            print(f"    {Colors.RED}{path}: {error}{Colors.RESET}")
+def print_creation_summary(counts):
+    """Print what create_project_structure did."""
+    project_structure_action = "updated" if counts["created_directories"] or counts["created_files"] else "no changes made"
+    print(f"{Colors.BOLD}Project structure {project_structure_action}.{Colors.RESET}")
+    print(f"  created: {Colors.GREEN}{counts['created_directories']} directories, {counts['created_files']} files{Colors.RESET}")
+    print(f"  skipped: {Colors.YELLOW}{counts['skipped_directories']} directories, {counts['skipped_files']} files{Colors.RESET} (already present)")
+    if counts["errors"]:
+        print(f"  {Colors.RED}failed:  {len(counts['errors'])} paths{Colors.RESET}")
+        for path, error in counts["errors"].items():
+            print(f"    {Colors.RED}{path}: {error}{Colors.RESET}")
+def _name_matcher(patterns):
+    """Compile a list of glob patterns into a single matcher for entry names."""
+    import fnmatch
+    if not patterns:
+        return lambda name: False
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns)).match
+def _scan_sorted(path, ignored):
+    """List a directory once with scandir, dropping ignored names, sorted by name."""
+    count("syscall: scandir")
+    with os.scandir(path) as it:
+        entries = [entry for entry in it if not ignored(entry.name)]
+    entries.sort(key=lambda entry: entry.name)
+    return entries
+def _count_tree(path, ignored):
+    """Count the directories and files below path, without following symlinks."""
+    directories, files = 0, 0
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                for entry in it:
+                    if ignored(entry.name): continue
+                    if entry.is_dir(follow_symlinks=False):
+                        directories += 1
+                        pending.append(entry.path)
+                    else:
+                        files += 1
+        except OSError:
+            continue
+    return directories, files
+@profiled("print_tree")
+def print_tree(base_path='.', prefix: str = "", max_depth=None, max_entries=None,
+               ignore=None, collapse=None, summarize_collapsed=True, out=None):
+    """
+    Print the directory structure in tree format with colors.
+    Walks iteratively with os.scandir, reusing each entry's cached type, and writes through a buffer.
+    Directories deeper than max_depth, or matching a collapse pattern, are not listed; with
+    summarize_collapsed they show a count of their contents instead. At most max_entries entries
+    are listed per directory. Names matching an ignore pattern (globs allowed) are skipped.
+    max_depth and max_entries default (None) to tree_max_depth and tree_max_entries; 0 means no limit.
+    """
+    max_depth = tree_max_depth if max_depth is None else max_depth
+    max_entries = tree_max_entries if max_entries is None else max_entries
+    ignored = _name_matcher(ignore_directories if ignore is None else ignore)
+    collapsed = _name_matcher(collapse_directories if collapse is None else collapse)
+    out = out or sys.stdout
+    buffer = []
+    def emit(line):
+        buffer.append(line)
+        if len(buffer) >= 512:
+            out.write("\n".join(buffer) + "\n")
+            buffer.clear()
+    def listing(path):
+        entries = _scan_sorted(path, ignored)
+        hidden = 0
+        if max_entries and len(entries) > max_entries:
+            hidden = len(entries) - max_entries
+            entries = entries[:max_entries]
+        return [entries, 0, hidden]
+
+    if ignored(os.path.basename(os.path.abspath(base_path))):
         return
     try:
-        contents = sorted(os.listdir(base_path))
-        if not contents:
-            return            
-        pointers = ["├── "] * (len(contents) - 1) + ["└── "]
-        
-        for pointer, item in zip(pointers, contents):
-            path = base_path / item # / operator to concatenate the base_path and item to form a new path.
-            if path.name in ignore_directories: continue
-            if path.is_dir():
-                color = Colors.YELLOW
-            else:
-                color = Colors.GREEN
-            print(prefix + pointer + color + item + Colors.RESET)
-            
-            if path.is_dir():
-                extension = "    " if pointer == "└── " else "│   "
-                print_tree(path, prefix + extension)
-    except Exception as e:
+        stack = [(listing(base_path), prefix, 1)]
+    except OSError as e:
         print(f"{Colors.RED}Error walking directory {base_path}: {str(e)}{Colors.RESET}")
+        return
+    while stack:
+        (frame, frame_prefix, depth) = stack[-1]
+        entries, position, hidden = frame
+        if position == len(entries):
+            if hidden:
+                emit(frame_prefix + "└── " + Colors.CYAN + f"... {hidden} more entries" + Colors.RESET)
+            stack.pop()
+            continue
+        frame[1] += 1
+        entry = entries[position]
+        is_last = position == len(entries) - 1 and not hidden
+        pointer = "└── " if is_last else "├── "
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            emit(frame_prefix + pointer + Colors.GREEN + entry.name + Colors.RESET)
+            continue
+        line = frame_prefix + pointer + Colors.YELLOW + entry.name + Colors.RESET
+        if collapsed(entry.name) or (max_depth and depth >= max_depth):
+            if summarize_collapsed and not entry.is_symlink(): # a link is listed, never followed, not even to count
+                directories, files = _count_tree(entry.path, ignored)
+                line += f" {Colors.CYAN}[{directories} directories, {files} files]{Colors.RESET}"
+            emit(line)
+            continue
+        emit(line)
+        if entry.is_symlink(): continue # listed, but never followed
+        extension = "    " if is_last else "│   "
+        try:
+            stack.append((listing(entry.path), frame_prefix + extension, depth + 1))
+        except OSError as e:
+            emit(f"{Colors.RED}Error walking directory {entry.path}: {str(e)}{Colors.RESET}")
+    if buffer:
+        out.write("\n".join(buffer) + "\n")
+    out.flush()
+def _archive_entries(project_structure_paths, templates, prefix):
+    """Yield (archive name, is directory, template) for every path, in order, one at a time."""
+    for path in project_structure_paths:
+        relative_path = os.path.normpath(path)
+        if relative_path in (".", ""): continue
+        name = prefix + relative_path.replace(os.sep, "/")
+        yield name, path.endswith("/"), templates.get(path)
+@profiled("export_archive")
+def export_archive(project_structure_paths, out, archive_format="tar", templates=None, prefix=""):
+    """
+    Stream the structure straight into a tar (optionally gzipped) or zip archive written to out,
+    without creating anything on disk. Entries are produced one at a time and template contents are
+    copied in chunks; for tar, memory stays flat however large the layout or its templates are.
+    A zip keeps one record per entry for its central directory, so its memory grows with the entry count.
+    out only needs to be writable, so a pipe such as stdout works too.
+    Returns the number of entries written.
+    """
+    from time import time, localtime
+    from shutil import copyfileobj
+    templates = templates or {}
+    unreadable = [] # checked up front, so a bad template never leaves a half-written archive behind
+    for path, template in templates.items():
+        try:
+            count("syscall: open")
+            os.close(os.open(template["source"], os.O_RDONLY))
+            if os.path.isdir(template["source"]): raise IsADirectoryError(errno.EISDIR, "Is a directory")
+        except OSError as e:
+            unreadable.append(f"{os.path.normpath(path)} <- {template['source']}: {e.strerror or str(e)}")
+    if unreadable:
+        raise OSError(f"{len(unreadable)} template sources cannot be read: " + "; ".join(unreadable))
+    now = int(time())
+    written = 0
+    if archive_format in ("tar", "tgz"):
+        import tarfile
+        with tarfile.open(fileobj=out, mode="w|gz" if archive_format == "tgz" else "w|") as archive:
+            for name, is_directory, template in _archive_entries(project_structure_paths, templates, prefix):
+                info = tarfile.TarInfo(name)
+                info.mtime = now
+                if is_directory:
+                    info.type, info.mode = tarfile.DIRTYPE, 0o755
+                    archive.addfile(info)
+                elif template:
+                    with open(template["source"], 'rb') as source:
+                        info.size, info.mode = os.fstat(source.fileno()).st_size, 0o644
+                        archive.addfile(info, source) # copied through in blocks
+                else:
+                    info.mode = 0o644
+                    archive.addfile(info)
+                archive.members.clear() # tarfile keeps every TarInfo otherwise, even when streaming
+                written += 1
+    elif archive_format == "zip":
+        import zipfile
+        with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, is_directory, template in _archive_entries(project_structure_paths, templates, prefix):
+                info = zipfile.ZipInfo(name + ("/" if is_directory else ""), date_time=localtime(now)[:6])
+                info.external_attr = ((0o40755 if is_directory else 0o100644) << 16) | (0x10 if is_directory else 0)
+                if is_directory or not template:
+                    archive.writestr(info, b"")
+                else:
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    with open(template["source"], 'rb') as source, archive.open(info, "w", force_zip64=True) as target:
+                        copyfileobj(source, target, 1 << 20)
+                written += 1
+    else:
+        raise ValueError(f"unknown archive format {archive_format}, expected tar, tgz or zip")
+    return written
+def parse(structure_file="project-structure"):
+    """Library API: parse a structure file, returning its paths (in generate_paths format). No sidecar cache is written."""
+    return load_structure(structure_file, cache_path=None)[1]
+def parse_templates(structure_file="project-structure"):
+    """Library API: the templates named in a structure file, as a dict of path -> template."""
+    lines_dict, project_structure_paths = load_structure(structure_file, cache_path=None)
+    return collect_templates(lines_dict, project_structure_paths)
+def plan(project_structure_paths, target="."):
+    """Library API: diff parsed paths against a target directory, see plan_structure."""
+    return plan_structure(project_structure_paths, root=target)
+def apply(structure_plan, target=".", workers=None, templates=None):
+    """Library API: create whatever a plan found missing under target, see create_project_structure."""
+    return create_project_structure(structure_plan["missing"], root=target, workers=workers, plan=structure_plan,
+                                    templates=templates)
+def scaffold(project_structure_paths, targets, jobs=4, workers=None, templates=None):
+    """
+    Library API: plan and apply the same parsed structure into many target directories, jobs of them at a time.
+    Targets are created if needed. Returns a dict of target -> counts (as from create_project_structure).
+    """
+    def scaffold_one(target):
+        try:
+            os.makedirs(target, exist_ok=True)
+        except OSError as e:
+            return target, {"created_directories": 0, "skipped_directories": 0, "created_files": 0, "skipped_files": 0,
+                            "errors": {target: str(e)}}
+        return target, apply(plan(project_structure_paths, target), target, workers, templates)
+    if jobs > 1 and len(targets) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(jobs, len(targets))) as pool:
+            return dict(pool.map(scaffold_one, targets))
+    return dict(map(scaffold_one, targets))
+def cli(argv):
+    """Non-interactive entry point, e.g. project-builder.py create --structure project-structure --target DIR [DIR ...]"""
+    import argparse
+    global debugger_mode
+    parser = argparse.ArgumentParser(prog="project-builder.py",
+                                     description="Create project skeletons from a project-structure file. "
+                                                 "Run without arguments for the interactive menu.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in [("paths", "print the paths parsed from the structure file"),
+                               ("plan", "compare the structure with target directories (dry run)"),
+                               ("create", "create the structure in target directories"),
+                               ("watch", "create the structure in a target directory, then keep it in step with the structure file"),
+                               ("export", "stream the structure into a tar or zip archive, without creating it on disk"),
+                               ]:
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("--structure", default="project-structure", help="structure file (default: project-structure)")
+        subparser.add_argument("--debug", action="store_true", help="print debug logs")
+        subparser.add_argument("--profile", action="store_true", help="print where the time went (to stderr)")
+        subparser.add_argument("--profile-json", metavar="FILE", help="write the profile spans and counters to FILE as JSON")
+        if command == "export":
+            subparser.add_argument("--format", choices=["tar", "tgz", "zip"], default="tar", help="archive format (default: tar)")
+            subparser.add_argument("--output", "-o", default="-", help="archive file, or - for stdout (default: -)")
+            subparser.add_argument("--prefix", default=None,
+                                   help="directory the entries are placed under (default: the root in the structure file)")
+        if command in ("paths", "export"): continue
+        subparser.add_argument("--target", nargs="+", default=["."], help="target directories (default: .)")
+        subparser.add_argument("--check-root", action="store_true",
+                               help="require each target's name to match the root in the structure file")
+        if command == "watch": continue
+        if command == "create":
+            subparser.add_argument("--jobs", type=int, default=4, help="targets scaffolded at a time (default: 4)")
+            subparser.add_argument("--workers", type=int, default=creation_workers,
+                                   help=f"threads per target (default: {creation_workers})")
+    args = parser.parse_args(argv)
+    debugger_mode = args.debug
+    if args.profile or args.profile_json:
+        enable_profiling()
+    try:
+        return _run_cli(parser, args)
+    finally:
+        if args.profile: print_profile()
+        if args.profile_json: dump_profile(args.profile_json)
+def _run_cli(parser, args):
+    """Carry out the parsed command line for cli()."""
+    lines_dict, project_structure_paths = load_structure(args.structure, cache_path=None)
+    if args.command == "paths":
+        for path in project_structure_paths:
+            print(path)
+        return 0
+    if args.command == "export":
+        stated_project_root = lines_dict.get(1)["line"][lines_dict.get(1)["pos_of_filefolder_name"]:].rstrip("/")
+        prefix = stated_project_root if args.prefix is None else args.prefix
+        prefix = prefix.rstrip("/") + "/" if prefix else ""
+        templates = collect_templates(lines_dict, project_structure_paths)
+        if args.output == "-" and sys.stdout.isatty():
+            parser.error("refusing to write an archive to a terminal, redirect stdout or use --output")
+        try:
+            if args.output == "-":
+                written = export_archive(project_structure_paths, sys.stdout.buffer, args.format, templates, prefix)
+                sys.stdout.buffer.flush()
+            else:
+                with open(args.output, 'wb') as out:
+                    written = export_archive(project_structure_paths, out, args.format, templates, prefix)
+        except OSError as e:
+            print(f"{Colors.RED}Export failed: {str(e)}{Colors.RESET}", file=sys.stderr)
+            if args.output != "-" and os.path.isfile(args.output):
+                os.remove(args.output) # a truncated archive is worse than none
+            return 1
+        print(f"{Colors.GREEN}{written} entries exported{Colors.RESET}", file=sys.stderr)
+        return 0
+    if args.check_root:
+        stated_project_root = lines_dict.get(1)["line"][lines_dict.get(1)["pos_of_filefolder_name"]:].rstrip("/")
+        mismatched = [target for target in args.target if os.path.basename(os.path.abspath(target)) != stated_project_root]
+        if mismatched:
+            print(f"{Colors.RED}Project root in {args.structure} ({stated_project_root}) does not match: {' '.join(mismatched)}{Colors.RESET}")
+            return 1
+    if args.command == "watch":
+        if len(args.target) != 1:
+            parser.error("watch takes a single --target")
+        watch_structure(args.structure, args.target[0])
+        return 0
+    if args.command == "plan":
+        for target in args.target:
+            print(f"\n{Colors.BOLD}{target}{Colors.RESET}")
+            print_plan(plan(project_structure_paths, target))
+        return 0
+    results = scaffold(project_structure_paths, args.target, jobs=args.jobs, workers=args.workers,
+                       templates=collect_templates(lines_dict, project_structure_paths))
+    for target, counts in results.items():
+        print(f"{Colors.BOLD}{target}{Colors.RESET}: "
+              f"created {counts['created_directories']} directories, {counts['created_files']} files; "
+              f"skipped {counts['skipped_directories']} directories, {counts['skipped_files']} files"
+              + (f"; {Colors.RED}{len(counts['errors'])} errors{Colors.RESET}" if counts["errors"] else ""))
+        for path, error in counts["errors"].items():
+            print(f"  {Colors.RED}{path}: {error}{Colors.RESET}")
+    return 1 if any(counts["errors"] for counts in results.values()) else 0
 def show_menu():
     """Display the interactive menu."""
     print(f"\n{Colors.BOLD}=== Project Builder Menu ==={Colors.RESET}")
     print(f"{Colors.CYAN}1  Show current structure{Colors.RESET}")
     print(f"{Colors.CYAN}2  Analyze project-structure file{Colors.RESET}")
+    print(f"{Colors.CYAN}p  Plan: compare project-structure with the disk (dry run){Colors.RESET}")
     print(f"{Colors.CYAN}3  Create project structure{Colors.RESET}")
+    print(f"{Colors.CYAN}w  Watch project-structure, creating new entries on every save{Colors.RESET}")
     print(f"{Colors.CYAN}4  Cleanup project structure{Colors.RESET}")
     print(f"{Colors.RED}4f Forceful cleanup{Colors.RESET}")
     print(f"{Colors.CYAN}r  Restart this script{Colors.RESET}")
@@ -273,13 +1253,12 @@ def show_menu():
         return -1
 def main():
     global debugger_mode
-    working_dir = Path('.').absolute()
+    working_dir = os.path.abspath('.')
     print(f"\n{Colors.BOLD}=== Project Builder ==={Colors.RESET}")
     print(f"pwd:  {working_dir}")
     while True:
         choice = show_menu().lower()
-        lines_dict = parse_structure_file()
-        project_structure_paths = generate_paths(lines_dict)
+        lines_dict, project_structure_paths = load_structure()
         actual_project_root = os.path.split(os.getcwd())[1]
         stated_project_root = lines_dict.get(1)["line"][lines_dict.get(1)["pos_of_filefolder_name"]:].rstrip("/")
         if stated_project_root != actual_project_root:
@@ -303,23 +1282,33 @@ def main():
             print(f"\n{Colors.BOLD}Parsed project structure paths:{Colors.RESET}")
             for path in project_structure_paths:
                 print(f"  {Colors.GREEN}{path}{Colors.RESET}")
+        elif choice == "p": # dry run: compare project-structure with the disk
+            print(f"\n{Colors.BOLD}Comparing project-structure with the working directory:{Colors.RESET}")
+            print_plan(plan_structure(project_structure_paths))
         elif choice == "3": # create project structure
             print(f"{Colors.YELLOW}Creating project structure...{Colors.RESET}")
-            project_structure_action = create_project_structure(project_structure_paths)
-            print(f"{Colors.BOLD}Project structure {project_structure_action}.{Colors.RESET}")
+            counts = create_project_structure(project_structure_paths, plan=plan_structure(project_structure_paths),
+                                              templates=collect_templates(lines_dict, project_structure_paths))
+            print_creation_summary(counts)
             print()
             print(f"{Colors.YELLOW}{stated_project_root}{Colors.RESET}")
             print_tree()        
+        elif choice == "w": # watch mode, until Ctrl-C
+            watch_structure()
         elif choice in ["4", "4f"]:  # cleanup project structure
             print(f"{Colors.YELLOW}Cleaning up project structure...\n{Colors.RESET}")
+            plan = plan_structure(project_structure_paths)
             if choice == "4":
+                present_directories = sum(path.endswith("/") for path in plan["present"])
                 warning = f"{Colors.YELLOW}This will remove {Colors.RED}ALL{Colors.YELLOW} files and directories\nspecified in the project-structure file{Colors.RESET}"
+                warning += f"\n({len(plan['present']) - present_directories} files and {present_directories} directories are present, use p to list them)"
             if choice == "4f":
                 warning = f"{Colors.YELLOW}This will {Colors.RED}REMOVE ALL{Colors.YELLOW} files and directories\nin the current working directory,\nexcept \"project-structure\" and \"project-builder.py\"{Colors.RESET}"    
             print(warning)   
             confirmation = input(f"{Colors.YELLOW}\n- press y or Y to confirm or any other key to abort mission{Colors.RESET}\n")
             if confirmation.lower() == "y":
-                cleanup_project_structure(project_structure_paths, forceful=True if choice == "4f" else False)
+                summary = cleanup_project_structure(project_structure_paths, forceful=True if choice == "4f" else False, plan=plan)
+                print_cleanup_summary(summary, forceful=True if choice == "4f" else False)
             else: 
                 print(f"{Colors.YELLOW}Aborting cleanup operation.{Colors.RESET}")
         elif choice == "x": # exit
@@ -327,6 +1316,7 @@ def main():
             sys.exit(0)
         elif choice == "r": # restart
             print("Restarting application ", end="", flush=True)
+            from time import sleep
             for _ in range(restart_dots):
                 sleep(restart_quickness)
                 print(".", end="", flush=True)
@@ -337,4 +1327,6 @@ def main():
         else: # invalid choice catcher
             print(f"\n{Colors.RED}{choice} is an invalid choice. Please select from the menu options only.{Colors.RESET}")
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli(sys.argv[1:]))
     main()
@@ -2,7 +2,29 @@
 import subprocess
 import re
 import os
+import sys
+import json
+import stat
+import heapq
+import hashlib
+import argparse
+import math
+import queue
+import time
+import shlex
+import signal
+import socket
+import select
+import shutil
+import termios
+import tty
+import threading
+import http.client
+import urllib.parse
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 # ANSI colors
 CYAN = "\033[96m"
@@ -17,15 +39,256 @@ BOLD = "\033[1m"
 ITALICS = "\x1B[3m"
 RESET = "\033[0m"
 
-def run_cmd(cmd):
-    """Run a shell command and return output as string."""
-    try:
-        return subprocess.check_output(cmd, shell=True, text=True).strip()
-    except subprocess.CalledProcessError:
+# --profile: timing spans and counters, recorded only while PROFILING is on (one check per call otherwise).
+# project-builder.py carries its own copy: both scripts are downloaded and run standalone, so they share no module.
+PROFILING = False
+PROFILE = {"spans": [], "counters": {}, "started": 0.0, "lock": threading.Lock()}
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter()
+        PROFILE["spans"].append((self.name, self.start - PROFILE["started"], end - self.start))  # list.append is atomic
+        return False
+
+
+def span(name):
+    """Time a block as a named span while profiling: with span("collector: host"): ..."""
+    return _Span(name) if PROFILING else _NO_SPAN
+
+def count(name, n=1):
+    """Add n to a named counter (subprocesses spawned, API requests, files read, ...) while profiling."""
+    if PROFILING:
+        with PROFILE["lock"]:
+            PROFILE["counters"][name] = PROFILE["counters"].get(name, 0) + n
+
+def enable_profiling():
+    global PROFILING
+    PROFILE.update(spans=[], counters={}, started=time.perf_counter())
+    PROFILING = True
+
+def profile_report():
+    """The recorded spans aggregated by name, sorted by total time, plus the counters and wall time."""
+    totals = {}
+    for name, start, seconds in PROFILE["spans"]:
+        total = totals.setdefault(name, {"name": name, "calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+        total["calls"] += 1
+        total["seconds"] += seconds
+        total["max_seconds"] = max(total["max_seconds"], seconds)
+    return {
+        "wall_seconds": time.perf_counter() - PROFILE["started"],
+        "spans": sorted(totals.values(), key=lambda total: total["seconds"], reverse=True),
+        "counters": dict(sorted(PROFILE["counters"].items())),
+    }
+
+def print_profile(out=None):
+    """Print the profile breakdown to stderr, away from the report itself."""
+    out = out or sys.stderr
+    report = profile_report()
+    wall = report["wall_seconds"] or 1e-9
+    print(f"\n{CYAN}=== Profile ({report['wall_seconds']:.3f}s wall) ==={RESET}", file=out)
+    print(f"{YELLOW}{'span':<40} {'calls':>6} {'total s':>9} {'max s':>9} {'% wall':>7}{RESET}", file=out)
+    for total in report["spans"]:  # collectors run concurrently, so shares can add up past 100%
+        print(f"{total['name']:<40} {total['calls']:>6} {total['seconds']:>9.4f} {total['max_seconds']:>9.4f} "
+              f"{total['seconds'] * 100 / wall:>6.1f}%", file=out)
+    if report["counters"]:
+        print(f"{YELLOW}{'counter':<40} {'count':>6}{RESET}", file=out)
+        for name, value in report["counters"].items():
+            print(f"{name:<40} {value:>6}", file=out)
+
+def dump_profile(file_path):
+    """Write the aggregated profile and every raw span (name, start offset, seconds) as JSON, for trend tracking."""
+    report = profile_report()
+    report["timestamp"] = time.time()
+    report["raw_spans"] = [{"name": name, "start": start, "seconds": seconds} for name, start, seconds in PROFILE["spans"]]
+    with open(file_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+RUN_CMD_TIMEOUT = 30  # seconds before a shell command (and everything it spawned) is killed
+
+def run_cmd(cmd, timeout=RUN_CMD_TIMEOUT):
+    """Run a shell command and return output as string ("" on failure or timeout)."""
+    count("subprocesses")
+    with span("cmd: " + " ".join(cmd.split()[:2])):
+        # own session, so a timeout kills the whole process group and not just the shell
+        # stderr is dropped: failures already come back as "", and the diagnostics would land on the report (or the dashboard)
+        proc = subprocess.Popen(cmd, shell=True, text=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                start_new_session=True)
+        try:
+            output, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.communicate()
+            count("subprocess timeouts")
+            return ""
+    if proc.returncode != 0:
         return ""
+    return output.strip()
+
+PROC_ROOT = "/proc"  # where host metrics are read from, instead of spawning uptime/free/df
+
+
+def read_loadavg(proc_root=PROC_ROOT):
+    """Return the 1, 5 and 15 minute load averages from /proc/loadavg."""
+    count("/proc reads")
+    with open(os.path.join(proc_root, "loadavg")) as f:
+        one, five, fifteen = f.read().split()[:3]
+    return float(one), float(five), float(fifteen)
+
+def read_meminfo(proc_root=PROC_ROOT):
+    """Return /proc/meminfo as a dict of field -> bytes."""
+    count("/proc reads")
+    meminfo = {}
+    with open(os.path.join(proc_root, "meminfo")) as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            parts = value.split()
+            if parts and parts[0].isdigit():
+                meminfo[key] = int(parts[0]) * (1024 if len(parts) > 1 and parts[1] == "kB" else 1)
+    return meminfo
+
+def read_mount_source(mount_point="/", proc_root=PROC_ROOT):
+    """Return the device mounted at mount_point, as df shows it (the last matching mount wins)."""
+    count("/proc reads")
+    source = "-"
+    try:
+        with open(os.path.join(proc_root, "mounts")) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[1] == mount_point:
+                    source = parts[0]
+    except OSError:
+        pass
+    return source
+
+def read_disk_usage(mount_point="/"):
+    """Return size/used/available bytes and use % of a filesystem, computed the way df does."""
+    st = os.statvfs(mount_point)
+    total = st.f_blocks * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    available = st.f_bavail * st.f_frsize
+    # df rounds the percentage up, and leaves out the blocks reserved for root
+    use_pct = -(-used * 100 // (used + available)) if used + available else 0
+    return {"size": total, "used": used, "available": available, "use_pct": use_pct}
+
+def human_size(num_bytes):
+    """Format bytes like df -h does: powers of 1024, rounded up, one decimal below 10."""
+    value = float(num_bytes)
+    for unit in ("", "K", "M", "G", "T", "P"):
+        if value < 1024 or unit == "P":
+            break
+        value /= 1024.0
+    if unit == "":
+        return f"{int(value)}"
+    if value < 10:
+        return f"{math.ceil(value * 10) / 10:.1f}{unit}"
+    return f"{math.ceil(value)}{unit}"
+
+def read_cpu_times(proc_root=PROC_ROOT):
+    """Return cumulative (busy, total) CPU time in jiffies from the aggregate line of /proc/stat."""
+    count("/proc reads")
+    with open(os.path.join(proc_root, "stat")) as f:
+        fields = [int(v) for v in f.readline().split()[1:]]
+    # user nice system idle iowait irq softirq steal [guest guest_nice]; guest time is already in user/nice
+    total = sum(fields[:8])
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0)
+    return total - idle, total
+
+def read_diskstats(proc_root=PROC_ROOT, sys_block="/sys/block"):
+    """Return cumulative (read, written) bytes over whole disks from /proc/diskstats (partitions, loop and ram devices left out)."""
+    count("/proc reads")
+    try:
+        disks = set(os.listdir(sys_block))
+    except OSError:
+        disks = None
+    read_bytes = written_bytes = 0
+    with open(os.path.join(proc_root, "diskstats")) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 10 or parts[2].startswith(("loop", "ram")):
+                continue
+            if disks is not None and parts[2] not in disks:
+                continue  # a partition: its disk is counted already
+            read_bytes += int(parts[5]) * 512  # diskstats sectors are always 512 bytes
+            written_bytes += int(parts[9]) * 512
+    return read_bytes, written_bytes
+
+def read_net_dev(proc_root=PROC_ROOT):
+    """Return cumulative (received, transmitted) bytes over all interfaces but lo from /proc/net/dev."""
+    count("/proc reads")
+    received = transmitted = 0
+    with open(os.path.join(proc_root, "net", "dev")) as f:
+        for line in f.readlines()[2:]:
+            name, _, counters = line.partition(":")
+            if name.strip() == "lo":
+                continue
+            fields = counters.split()
+            received += int(fields[0])
+            transmitted += int(fields[8])
+    return received, transmitted
+
+def get_host_metrics(proc_root=PROC_ROOT, mount_point="/"):
+    """Collect load, memory and root disk usage in-process, as exact numbers.
+
+    Memory "used" is MemTotal - MemAvailable, as recent versions of free report it.
+    """
+    load_1m, load_5m, load_15m = read_loadavg(proc_root)
+    meminfo = read_meminfo(proc_root)
+    mem_total = meminfo.get("MemTotal", 0)
+    mem_available = meminfo.get("MemAvailable", meminfo.get("MemFree", 0))
+    disk = read_disk_usage(mount_point)
+    return {
+        "load_1m": load_1m,
+        "load_5m": load_5m,
+        "load_15m": load_15m,
+        "mem_total_bytes": mem_total,
+        "mem_used_bytes": mem_total - mem_available,
+        "mem_available_bytes": mem_available,
+        "disk_source": read_mount_source(mount_point, proc_root),
+        "disk_mount": mount_point,
+        "disk_size_bytes": disk["size"],
+        "disk_used_bytes": disk["used"],
+        "disk_available_bytes": disk["available"],
+        "disk_use_pct": disk["use_pct"],
+    }
 
 def get_ec2_metrics():
     """Fetch EC2-level resource utilization."""
+    try:
+        host = get_host_metrics()
+    except OSError:  # no /proc (not Linux): fall back to the shell tools
+        return get_ec2_metrics_from_commands()
+    total_mem = host["mem_total_bytes"] // (1024 * 1024)
+    used_mem = host["mem_used_bytes"] // (1024 * 1024)
+    mem_pct = used_mem * 100 / total_mem if total_mem else 0
+    return {
+        "CPU Load (1/5/15m)": f"{host['load_1m']:.2f}, {host['load_5m']:.2f}, {host['load_15m']:.2f}",
+        "Memory Used": f"{used_mem} MB / {total_mem} MB ({mem_pct:.1f}%)",
+        "Disk Root": f"{human_size(host['disk_used_bytes'])} / {human_size(host['disk_size_bytes'])} ({host['disk_use_pct']}%)"
+    }
+
+def get_ec2_metrics_from_commands():
+    """Fetch EC2-level resource utilization by parsing uptime, free and df."""
     loadavg = run_cmd("uptime").split("load average:")[-1].strip()
 
     meminfo = run_cmd("free -m").splitlines()
@@ -44,50 +307,678 @@ def get_ec2_metrics():
 
 def get_ebs_volume():
     """Get only the root volume capacity and usage."""
-    return run_cmd("df -h /").splitlines()[-1]
+    try:
+        disk = read_disk_usage("/")
+    except OSError:
+        return run_cmd("df -h /").splitlines()[-1]
+    return "  ".join([
+        read_mount_source("/"), human_size(disk["size"]), human_size(disk["used"]),
+        human_size(disk["available"]), f"{disk['use_pct']}%", "/"
+    ])
 
-def get_container_metrics():
-    """Fetch Docker container metrics: ps + stats merged."""
-    ps_cmd = (
-        "docker ps --format "
-        "'{{.ID}}\t{{.Names}}\t{{.Image}}\t{{.Status}}'"
-    )
-    ps_lines = run_cmd(ps_cmd).splitlines()
-    ps_data = {}
-    for line in ps_lines:
+DU_ROOTS = ["/var/lib/docker", "/var/log", "/home", "/root"]  # default roots for --du
+DU_CACHE_FILE = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "resource-check", "du-cache.json")
+DU_CACHE_VERSION = 1
+DU_CACHE_MAX_AGE = 6 * 3600  # seconds; a file growing in place does not change its directory's mtime, so rescan after this
+DU_WORKERS = 8
+DU_TOP = 10
+
+
+def scan_directory(path, device, keep_files=DU_TOP):
+    """
+    One directory's own usage, without descending: bytes of its files (st_blocks, as du counts),
+    its largest files, the subdirectories on the same filesystem, and hardlinked files as [inode, bytes, name]
+    so they can be counted once across the whole walk.
+    """
+    own_bytes, files, subdirs, links = 0, [], [], []
+    count("du: scandir")
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if st.st_dev == device:  # don't cross into other mounts
+                    subdirs.append(entry.name)
+                continue
+            size = st.st_blocks * 512
+            if st.st_nlink > 1:
+                links.append([st.st_ino, size, entry.name])
+            else:
+                own_bytes += size
+                files.append([size, entry.name])
+    files.sort(reverse=True)
+    return {"own_bytes": own_bytes, "files": files[:keep_files], "subdirs": subdirs, "links": links}
+
+def read_du_cache(cache_path, top):
+    try:
+        with open(cache_path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != DU_CACHE_VERSION or cache.get("top", 0) < top:
+        return {}
+    return cache.get("directories", {})
+
+def write_du_cache(cache_path, directories, top):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": DU_CACHE_VERSION, "top": top, "directories": directories}, f, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)  # never leave a half-written cache behind
+    except OSError:
+        pass
+
+def analyze_disk_usage(roots=DU_ROOTS, top=DU_TOP, cache_path=DU_CACHE_FILE, max_age=DU_CACHE_MAX_AGE, workers=DU_WORKERS):
+    """
+    Walk roots with parallel scandir workers and return the top directories and files by disk usage.
+    Every directory's own usage is cached against its mtime, so a later run rescans only directories whose
+    entries changed (or whose cache entry is older than max_age) and stats the rest. The walk stays on each
+    root's filesystem, and hardlinked files are counted once.
+    """
+    started, now = time.monotonic(), time.time()
+    cache = read_du_cache(cache_path, top) if cache_path else {}
+    directories = {}  # path -> cache entry
+    reused = 0
+
+    def visit(path, device):
+        st = os.lstat(path)
+        entry = cache.get(path)
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and now - entry["scanned"] < max_age:
+            count("du: cached directories")
+            return path, entry, device, True
+        # stat before scanning: a change during the scan leaves an older mtime behind, so the next run rescans
+        entry = scan_directory(path, device, top)
+        entry.update({"mtime_ns": st.st_mtime_ns, "scanned": now, "dir_bytes": st.st_blocks * 512})
+        return path, entry, device, False
+
+    with span("du: walk"), ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for root in roots:
+            try:
+                st = os.lstat(root)
+            except OSError:
+                continue
+            if stat.S_ISDIR(st.st_mode):
+                pending.add(pool.submit(visit, os.path.abspath(root), st.st_dev))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    path, entry, device, from_cache = future.result()
+                except OSError:
+                    continue  # vanished or unreadable
+                directories[path] = dict(entry, device=device)
+                reused += from_cache
+                for name in entry["subdirs"]:
+                    pending.add(pool.submit(visit, os.path.join(path, name), device))
+
+    # totals bottom-up, deepest first; hardlinked files are charged to the first directory met holding them
+    totals, files, seen_links = {}, [], set()
+    for path in sorted(directories, key=lambda p: p.count(os.sep), reverse=True):
+        entry = directories[path]
+        total = entry["own_bytes"] + entry["dir_bytes"]
+        for inode, size, name in entry["links"]:
+            if (entry["device"], inode) not in seen_links:
+                seen_links.add((entry["device"], inode))
+                total += size
+                files.append((size, os.path.join(path, name)))
+        total += sum(totals.get(os.path.join(path, name), 0) for name in entry["subdirs"])
+        totals[path] = total
+        files.extend((size, os.path.join(path, name)) for size, name in entry["files"])
+
+    if cache_path:
+        write_du_cache(cache_path, {path: {k: v for k, v in entry.items() if k != "device"} for path, entry in directories.items()}, top)
+    return {
+        "roots": [os.path.abspath(root) for root in roots if os.path.isdir(root)],
+        "total_bytes": sum(totals[path] for path in directories if os.path.dirname(path) not in directories),
+        "directories": sorted(((size, path) for path, size in totals.items()), reverse=True)[:top],
+        "files": heapq.nlargest(top, files),
+        "scanned_directories": len(directories) - reused,
+        "cached_directories": reused,
+        "seconds": round(time.monotonic() - started, 3),
+    }
+
+def get_disk_usage_report(report):
+    """The analyzer's result as (summary dict, largest directories rows, largest files rows) for print_table."""
+    summary = {
+        "Roots": ", ".join(report["roots"]) or "None",
+        "Total": human_size(report["total_bytes"]),
+        "Walk": f"{report['scanned_directories']} directories scanned, {report['cached_directories']} from cache, {report['seconds']:.2f}s",
+    }
+    directories = ["SIZE\tDIRECTORY"] + [f"{human_size(size)}\t{path}" for size, path in report["directories"]]
+    files = ["SIZE\tFILE"] + [f"{human_size(size)}\t{path}" for size, path in report["files"]]
+    return summary, directories, files
+
+DOCKER_HOST = os.environ.get("DOCKER_HOST", "unix:///var/run/docker.sock")
+DOCKER_API_TIMEOUT = 30  # seconds; docker stats and size calculations can take a while on busy hosts
+DOCKER_API_POOL_SIZE = 8  # keep-alive connections shared by concurrent requests
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection over a unix domain socket."""
+
+    def __init__(self, socket_path, timeout=DOCKER_API_TIMEOUT):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+class DockerAPIError(Exception):
+    """The Docker Engine API answered with an error status."""
+
+
+class DockerClient:
+    """Small Docker Engine API client speaking HTTP over the daemon's unix socket.
+
+    Connections are kept alive and pooled, so a report costs a handful of requests on
+    already-open sockets instead of one docker CLI process per container.
+    """
+
+    def __init__(self, socket_path, timeout=DOCKER_API_TIMEOUT, pool_size=DOCKER_API_POOL_SIZE):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connection(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            count("docker api connections")
+            return UnixHTTPConnection(self.socket_path, self.timeout)
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def get(self, path, **params):
+        """GET an API path and return the decoded JSON body."""
+        query = {k: (json.dumps(v) if isinstance(v, (dict, list)) else v) for k, v in params.items() if v is not None}
+        url = path + ("?" + urllib.parse.urlencode(query) if query else "")
+        for attempt in (1, 2):  # a pooled connection may have been closed by the daemon meanwhile
+            conn = self._connection()
+            count("docker api requests")
+            try:
+                with span("docker api: " + re.sub(r"/[0-9a-f]{12,}|/sha256:[0-9a-f]+", "/{id}", path)):
+                    conn.request("GET", url, headers={"Host": "docker"})
+                    resp = conn.getresponse()
+                    body = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if attempt == 2:
+                    raise
+                continue
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            if resp.status >= 400:
+                raise DockerAPIError(f"GET {path}: {resp.status} {body[:200].decode(errors='replace')}")
+            return json.loads(body) if body else None
+
+    def ping(self):
+        """Raise unless the daemon answers /_ping (which returns plain "OK", not JSON)."""
+        conn = self._connection()
+        try:
+            conn.request("GET", "/_ping", headers={"Host": "docker"})
+            resp = conn.getresponse()
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            raise
+        self._release(conn)
+        if resp.status != 200:
+            raise DockerAPIError(f"GET /_ping: {resp.status}")
+
+    def containers(self, all=False, size=False, filters=None):
+        return self.get("/containers/json", all=int(all), size=int(size), filters=filters)
+
+    def images(self, all=False):
+        return self.get("/images/json", all=int(all))
+
+    def image(self, image_id):
+        return self.get(f"/images/{image_id}/json")
+
+    def system_df(self):
+        """Images, containers and volumes with their sizes, in one call (what docker system df uses)."""
+        return self.get("/system/df")
+
+    def info(self):
+        return self.get("/info")
+
+    def container_stats(self, container_id):
+        return self.get(f"/containers/{container_id}/stats", stream="false")
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_docker_client = None
+
+
+def docker_client():
+    """Return a shared DockerClient if the daemon's unix socket answers, else None (the CLI is used instead)."""
+    global _docker_client
+    if _docker_client is None:
+        if not DOCKER_HOST.startswith("unix://"):
+            return None
+        client = DockerClient(DOCKER_HOST[len("unix://"):])
+        try:
+            client.ping()
+        except (OSError, http.client.HTTPException, DockerAPIError):
+            return None
+        _docker_client = client
+    return _docker_client
+
+def docker_size(num_bytes):
+    """Format bytes the way the docker CLI does: decimal units, three significant digits."""
+    value = float(num_bytes)
+    for unit in ("B", "kB", "MB", "GB", "TB"):
+        if value < 1000 or unit == "TB":
+            break
+        value /= 1000.0
+    return f"{value:.3g}{unit}"
+
+def parse_container_stats(stats):
+    """Compute CPU %, memory and block I/O from a Docker stats document, with the docker CLI's formulas."""
+    cpu_stats, precpu_stats = stats.get("cpu_stats") or {}, stats.get("precpu_stats") or {}
+    cpu_delta = (cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+                 - precpu_stats.get("cpu_usage", {}).get("total_usage", 0))
+    system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get("system_cpu_usage", 0)
+    online_cpus = cpu_stats.get("online_cpus") or len(cpu_stats.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+    cpu_pct = cpu_delta / system_delta * online_cpus * 100.0 if system_delta > 0 and cpu_delta > 0 else 0.0
+
+    memory = stats.get("memory_stats") or {}
+    mem_stats = memory.get("stats") or {}
+    # page cache that can be dropped is not counted as used: inactive_file (cgroup v2) or total_inactive_file (v1)
+    cache = mem_stats.get("inactive_file", mem_stats.get("total_inactive_file", 0))
+    mem_used = max(memory.get("usage", 0) - cache, 0)
+    mem_limit = memory.get("limit", 0)
+    mem_pct = mem_used * 100.0 / mem_limit if mem_limit else 0.0
+
+    io_read = io_write = 0
+    for entry in (stats.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []:
+        if entry.get("op", "").lower() == "read":
+            io_read += entry.get("value", 0)
+        elif entry.get("op", "").lower() == "write":
+            io_write += entry.get("value", 0)
+    return {
+        "cpu_pct": cpu_pct,
+        "mem_pct": mem_pct,
+        "mem_used_bytes": mem_used,
+        "mem_limit_bytes": mem_limit,
+        "io_read_bytes": io_read,
+        "io_write_bytes": io_write,
+    }
+
+CGROUP_ROOT = "/sys/fs/cgroup"  # cgroup v2 unified hierarchy
+CGROUP_CPU_INTERVAL = 0.5  # seconds between the two cpu.stat reads CPU % is computed from
+
+
+def container_cgroup_dir(container_id, cgroup_root=CGROUP_ROOT):
+    """Return the cgroup v2 directory of a container (full ID), or None if it has none we can read."""
+    candidates = [
+        os.path.join(cgroup_root, "system.slice", f"docker-{container_id}.scope"),  # systemd cgroup driver
+        os.path.join(cgroup_root, "docker", container_id),  # cgroupfs cgroup driver
+    ]
+    for path in candidates:
+        if os.path.isfile(os.path.join(path, "cpu.stat")):
+            return path
+    return None
+
+def read_flat_keyed(path):
+    """Read a cgroup "key value" file such as cpu.stat or memory.stat into a dict of ints."""
+    values = {}
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                values[parts[0]] = int(parts[1])
+    return values
+
+def read_cgroup_stats(cgroup_dir):
+    """
+    Read one container's cgroup v2 counters: cumulative CPU time, memory use and limit, and I/O bytes.
+    memory_max_bytes is None for an unlimited cgroup; memory_used_bytes leaves out reclaimable page cache like docker stats does.
+    """
+    count("cgroup reads")
+    cpu = read_flat_keyed(os.path.join(cgroup_dir, "cpu.stat"))
+    with open(os.path.join(cgroup_dir, "memory.current")) as f:
+        memory_current = int(f.read())
+    with open(os.path.join(cgroup_dir, "memory.max")) as f:
+        memory_max = f.read().strip()
+    try:
+        inactive_file = read_flat_keyed(os.path.join(cgroup_dir, "memory.stat")).get("inactive_file", 0)
+    except OSError:
+        inactive_file = 0
+    io_read = io_write = 0
+    try:
+        with open(os.path.join(cgroup_dir, "io.stat")) as f:
+            for line in f:  # "8:0 rbytes=1459200 wbytes=314773504 rios=192 wios=353 dbytes=0 dios=0", one line per device
+                for field in line.split()[1:]:
+                    key, _, value = field.partition("=")
+                    if key == "rbytes":
+                        io_read += int(value)
+                    elif key == "wbytes":
+                        io_write += int(value)
+    except OSError:
+        pass
+    return {
+        "cpu_usage_usec": cpu.get("usage_usec", 0),
+        "memory_used_bytes": max(memory_current - inactive_file, 0),
+        "memory_max_bytes": None if memory_max == "max" else int(memory_max),
+        "io_read_bytes": io_read,
+        "io_write_bytes": io_write,
+    }
+
+def collect_cgroup_stats(container_ids, cgroup_root=CGROUP_ROOT, interval=CGROUP_CPU_INTERVAL, proc_root=PROC_ROOT):
+    """
+    Per-container stats straight from cgroup v2, keyed by full container ID; containers without a readable
+    cgroup are left out. CPU % is the CPU time used between two reads interval seconds apart (100% = one core).
+    """
+    dirs = {cid: container_cgroup_dir(cid, cgroup_root) for cid in container_ids}
+    dirs = {cid: path for cid, path in dirs.items() if path}
+    if not dirs:
+        return {}
+    first, started = {}, time.monotonic()
+    for cid, path in dirs.items():
+        try:
+            first[cid] = read_cgroup_stats(path)["cpu_usage_usec"]
+        except (OSError, ValueError):
+            pass
+    time.sleep(interval)
+    elapsed_usec = (time.monotonic() - started) * 1e6
+    try:
+        host_memory = read_meminfo(proc_root)["MemTotal"]
+    except (OSError, KeyError, ValueError):
+        host_memory = None
+    stats = {}
+    for cid in first:
+        try:
+            current = read_cgroup_stats(dirs[cid])
+        except (OSError, ValueError):
+            continue  # container went away between the two reads
+        limit = current["memory_max_bytes"] or host_memory
+        stats[cid] = {
+            "cpu_pct": max(current["cpu_usage_usec"] - first[cid], 0) * 100.0 / elapsed_usec,
+            "mem_pct": current["memory_used_bytes"] * 100.0 / limit if limit else None,
+            "mem_used_bytes": current["memory_used_bytes"],
+            "mem_limit_bytes": limit,
+            "io_read_bytes": current["io_read_bytes"],
+            "io_write_bytes": current["io_write_bytes"],
+        }
+    return stats
+
+def list_containers(client=None):
+    """Running containers (full ID, name, image, status), from the API when there is a client, else docker ps."""
+    if client is not None:
+        return [{
+            "id": c["Id"],
+            "name": (c.get("Names") or ["/-"])[0].lstrip("/"),
+            "image": c.get("Image", ""),
+            "status": c.get("Status", ""),
+        } for c in client.containers()]
+    containers = []
+    for line in run_cmd("docker ps --no-trunc --format '{{.ID}}\t{{.Names}}\t{{.Image}}\t{{.Status}}'").splitlines():
         parts = line.split("\t")
         if len(parts) >= 4:
-            cid, name, image, status = parts[:4]
-            ps_data[cid] = {
-                "Name": name,
-                "Image": image,
-                "Status": status,
-                "CPU %": "-",
-                "Mem %": "-"
-            }
-
-    stats_cmd = (
-        "docker stats --no-stream --format "
-        "'{{.ID}}\t{{.CPUPerc}}\t{{.MemPerc}}'"
-    )
-    stats_lines = run_cmd(stats_cmd).splitlines()
-    for line in stats_lines:
+            containers.append({"id": parts[0], "name": parts[1], "image": parts[2], "status": parts[3]})
+    return containers
+
+def container_stats_from_api(client, container_ids):
+    """Stats for the given containers from the API's one-shot stats endpoint, fetched concurrently."""
+    def stats_for(cid):
+        try:
+            return cid, parse_container_stats(client.container_stats(cid))
+        except (OSError, http.client.HTTPException, ValueError, DockerAPIError):
+            return cid, None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(client.pool_size, len(container_ids)))) as pool:
+        return {cid: stats for cid, stats in pool.map(stats_for, container_ids) if stats}
+
+def container_stats_from_commands(container_ids):
+    """CPU % and MEM % for the given containers from docker stats --no-stream (blocks for its sampling window)."""
+    wanted = set(container_ids)
+    stats = {}
+    for line in run_cmd("docker stats --no-stream --no-trunc --format '{{.ID}}\t{{.CPUPerc}}\t{{.MemPerc}}'").splitlines():
         parts = line.split("\t")
-        if len(parts) == 3:
-            cid, cpu, mem = parts
-            if cid in ps_data:
-                ps_data[cid]["CPU %"] = cpu
-                ps_data[cid]["Mem %"] = mem
+        if len(parts) == 3 and parts[0] in wanted:
+            try:
+                cpu_pct, mem_pct = float(parts[1].rstrip("%")), float(parts[2].rstrip("%"))
+            except ValueError:
+                continue
+            stats[parts[0]] = {"cpu_pct": cpu_pct, "mem_pct": mem_pct}
+    return stats
+
+def collect_containers(client=None, cgroup_root=CGROUP_ROOT, interval=CGROUP_CPU_INTERVAL):
+    """
+    Running containers with their resource use as numbers (None where unknown).
+    Stats come from cgroup v2 where the container's cgroup is readable; the rest are asked of the
+    daemon: the API's stats endpoint with a client, docker stats --no-stream without one.
+    """
+    containers = list_containers(client)
+    ids = [c["id"] for c in containers]
+    stats = collect_cgroup_stats(ids, cgroup_root, interval)
+    missing = [cid for cid in ids if cid not in stats]
+    if missing:
+        stats.update(container_stats_from_api(client, missing) if client is not None else container_stats_from_commands(missing))
+    fields = ["cpu_pct", "mem_pct", "mem_used_bytes", "mem_limit_bytes", "io_read_bytes", "io_write_bytes"]
+    for container in containers:
+        container_stats = stats.get(container["id"], {})
+        container.update({field: container_stats.get(field) for field in fields})
+    return containers
+
+def layer_chain_ids(diff_ids):
+    """Turn an image's rootfs diff IDs into the chain IDs its layers are stored under in layerdb."""
+    chain_ids = []
+    for diff_id in diff_ids:
+        if chain_ids:
+            diff_id = "sha256:" + hashlib.sha256(f"{chain_ids[-1]} {diff_id}".encode()).hexdigest()
+        chain_ids.append(diff_id)
+    return chain_ids
+
+def read_image_diff_ids(image_root, image_id):
+    """An image's rootfs diff IDs from its config in the daemon's imagedb, or None if it can't be read."""
+    try:
+        with open(os.path.join(image_root, "imagedb", "content", *image_id.split(":", 1))) as f:
+            return json.load(f)["rootfs"]["diff_ids"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def read_layer_size(image_root, chain_id):
+    """The bytes a layer takes on disk, from layerdb, or None if it can't be read."""
+    try:
+        with open(os.path.join(image_root, "layerdb", *chain_id.split(":", 1), "size")) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+def image_layers(client, image_ids):
+    """
+    Return ({image id: [chain id]}, {chain id: size in bytes}), or None when the layer sizes can't all be read.
+    Image configs are read from the daemon's imagedb when we may (root), else asked of the API;
+    layer sizes only live in layerdb.
+    """
+    info = client.info()
+    image_root = os.path.join(info.get("DockerRootDir", "/var/lib/docker"), "image", info.get("Driver", "overlay2"))
+    if not os.access(os.path.join(image_root, "layerdb"), os.R_OK | os.X_OK):
+        return None  # without layer sizes the configs are no use, so don't ask the API for every image's
+    diff_ids = {image_id: read_image_diff_ids(image_root, image_id) for image_id in image_ids}
+    missing = [image_id for image_id, ids in diff_ids.items() if ids is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=max(1, min(client.pool_size, len(missing)))) as pool:
+            for image_id, image in zip(missing, pool.map(client.image, missing)):
+                diff_ids[image_id] = image.get("RootFS", {}).get("Layers") or []
+    layers = {image_id: layer_chain_ids(ids) for image_id, ids in diff_ids.items()}
+    sizes = {}
+    for chain_id in {chain_id for chains in layers.values() for chain_id in chains}:
+        sizes[chain_id] = read_layer_size(image_root, chain_id)
+        if sizes[chain_id] is None:
+            return None
+    return layers, sizes
+
+def rank_image_removal(candidates, layers, sizes, in_use_layers):
+    """
+    Order candidate images so that removing them in turn frees the most bytes soonest.
+    A layer is freed once the last candidate holding it is gone, and never if a running container needs it.
+    Returns [(image id, bytes freed by removing it after the ones before it)].
+    """
+    owners = {}
+    for image_id in candidates:
+        for chain_id in set(layers[image_id]) - in_use_layers:
+            owners.setdefault(chain_id, set()).add(image_id)
+    remaining = set(candidates)
+    ranked = []
+    while remaining:
+        def score(image_id):
+            freed = shared = 0
+            for chain_id in set(layers[image_id]) - in_use_layers:
+                holders = owners[chain_id]
+                if len(holders) == 1:
+                    freed += sizes[chain_id]
+                else:  # progress towards freeing a shared layer breaks ties
+                    shared += sizes[chain_id] / len(holders)
+            return freed, shared, image_id
+        freed, _, image_id = max(score(image_id) for image_id in remaining)
+        ranked.append((image_id, freed))
+        remaining.discard(image_id)
+        for chain_id in set(layers[image_id]) - in_use_layers:
+            owners[chain_id].discard(image_id)
+    return ranked
+
+def collect_housekeeping(client):
+    """
+    Unused images and stopped containers, with sizes in bytes, from one /system/df call.
+    Image space is counted per layer: images share layers, so the space freed is the size of the layers
+    no running container's image uses, each counted once (not the sum of image sizes). Untagged parents of
+    other images (the intermediate images of docker images -a) go with their children and are not listed.
+    When layerdb can't be read (not root) Docker's own accounting is used instead: an image frees its
+    Size - SharedSize, and the total is the sum of those, a lower bound that leaves out every shared layer
+    (layers shared only between unused images would be freed too, but can't be told apart without layerdb).
+    """
+    df = client.system_df()
+    images = {image["Id"]: image for image in df.get("Images") or []}
+    containers = df.get("Containers") or []
+    running_image_ids = {c.get("ImageID") for c in containers if c.get("State") == "running"}
+    parent_ids = {image.get("ParentId") for image in images.values()}
+    candidates = [
+        image_id for image_id, image in images.items()
+        if image_id not in running_image_ids
+        and not (image_id in parent_ids and not [t for t in image.get("RepoTags") or [] if t != "<none>:<none>"])
+    ]
 
-    header = ["CONTAINER ID", "NAME", "IMAGE", "STATUS", "CPU %", "MEM %"]
+    with span("housekeeping: layer index"):
+        layer_info = image_layers(client, list(images)) if candidates else None
+    if layer_info:
+        layers, sizes = layer_info
+        in_use_layers = {chain_id for image_id in running_image_ids if image_id in layers for chain_id in layers[image_id]}
+        ranked = rank_image_removal(candidates, layers, sizes, in_use_layers)
+        accounting = "layers"
+    else:
+        unique = {image_id: max(images[image_id].get("Size", 0) - max(images[image_id].get("SharedSize", 0), 0), 0)
+                  for image_id in candidates}
+        ranked = sorted(unique.items(), key=lambda item: item[1], reverse=True)
+        accounting = "unique-size"
+
+    unused_images = []
+    for image_id, freed in ranked:
+        image = images[image_id]
+        unused_images.append({
+            "id": image_id,
+            "tags": [t for t in image.get("RepoTags") or [] if t != "<none>:<none>"] or ["<none>:<none>"],
+            "size_bytes": image.get("Size", 0),
+            "freed_bytes": freed,
+        })
+    unused_bytes = sum(freed for _, freed in ranked)
+
+    stopped_containers = []
+    for container in containers:
+        if container.get("State") != "exited":
+            continue
+        stopped_containers.append({
+            "id": container["Id"][:12],
+            "name": (container.get("Names") or ["/-"])[0].lstrip("/"),
+            "size_bytes": container.get("SizeRw", 0) or 0,
+        })
+    stopped_bytes = sum(c["size_bytes"] for c in stopped_containers)
+    return {
+        "unused_images": unused_images,
+        "stopped_containers": stopped_containers,
+        "unused_images_bytes": unused_bytes,
+        "stopped_containers_bytes": stopped_bytes,
+        "reclaimable_bytes": unused_bytes + stopped_bytes,
+        "accounting": accounting,
+    }
+
+def docker_cli_reachable():
+    """Whether the docker CLI reaches a daemon (its commands print nothing both when idle and when failing)."""
+    return bool(run_cmd("docker version --format '{{.Server.Version}}'"))
+
+def require_docker_cli():
+    """Raise unless the docker CLI reaches a daemon, so a fallback never reports "nothing there" for "no data"."""
+    if not docker_cli_reachable():
+        raise DockerAPIError("no Docker daemon reachable, through the API socket or the docker CLI")
+
+def collect_docker_containers():
+    """collect_containers through the API when the daemon socket answers, through the docker CLI otherwise."""
+    client = docker_client()
+    if client is not None:
+        try:
+            return collect_containers(client)
+        except (OSError, http.client.HTTPException, ValueError, DockerAPIError):
+            pass
+    require_docker_cli()
+    return collect_containers(None)
+
+def collect_docker_housekeeping():
+    """collect_housekeeping through the API when the daemon socket answers, through the docker CLI otherwise."""
+    client = docker_client()
+    if client is not None:
+        try:
+            return collect_housekeeping(client)
+        except (OSError, http.client.HTTPException, ValueError, DockerAPIError):
+            pass
+    require_docker_cli()
+    return collect_housekeeping_from_commands()
+
+def get_container_metrics():
+    """Fetch Docker container metrics: running containers with CPU, memory and block I/O."""
+    containers = collect_docker_containers()
+
+    def pct(value):
+        return f"{value:.2f}%" if value is not None else "-"
+
+    def pair(first, second):
+        return f"{docker_size(first)} / {docker_size(second)}" if first is not None and second is not None else "-"
+
+    header = ["CONTAINER ID", "NAME", "IMAGE", "STATUS", "CPU %", "MEM %", "MEM USAGE / LIMIT", "BLOCK I/O"]
     rows = ["\t".join(header)]
-    for cid, info in ps_data.items():
+    for c in containers:
         rows.append("\t".join([
-            cid, info["Name"], info["Image"],
-            info["Status"], info["CPU %"], info["Mem %"]
+            c["id"][:12], c["name"], c["image"], c["status"],
+            pct(c["cpu_pct"]), pct(c["mem_pct"]),
+            pair(c["mem_used_bytes"], c["mem_limit_bytes"]),
+            pair(c["io_read_bytes"], c["io_write_bytes"]),
         ]))
+    return rows
 
-    return rows if rows else ["No containers running."]
+def get_docker_housekeeping():
+    """Compute unused images size + stopped containers size and return an estimated reclaimable summary."""
+    return format_housekeeping(collect_docker_housekeeping())
 
 def parse_size(size_str):
     """Convert human-readable size to MB (float).
@@ -128,9 +1019,8 @@ def parse_size(size_str):
         return value / (1024.0 * 1024.0)
     return 0.0
 
-def get_docker_housekeeping():
-    """Compute unused images size + stopped containers size and return an estimated reclaimable summary."""
-    
+def collect_housekeeping_from_commands():
+    """collect_housekeeping from docker CLI output, for hosts where the API socket can't be used."""
     # Get image IDs currently used by running containers
     used_image_ids = set()
     running_containers = run_cmd("docker ps -q --no-trunc")
@@ -141,10 +1031,9 @@ def get_docker_housekeeping():
                 used_image_ids.add(image_id)
 
     # Get ALL images with their full IDs
-    all_images_raw = run_cmd("docker images -a --no-trunc --format '{{.ID}} {{.Repository}}:{{.Tag}} {{.Size}}'")
-    unused_total_mb = 0.0
-    unused_items = []
-    
+    all_images_raw = run_cmd("docker images --no-trunc --format '{{.ID}} {{.Repository}}:{{.Tag}} {{.Size}}'")
+    unused_images = []
+
     for line in all_images_raw.splitlines():
         if not line.strip():
             continue
@@ -152,37 +1041,63 @@ def get_docker_housekeeping():
         if len(parts) == 2:
             info, size_token = parts
             image_id = info.split()[0]
-            
+
             # Consider image unused if it's NOT used by any running container
             if image_id not in used_image_ids:
-                unused_total_mb += parse_size(size_token)
-                repo_tag_part = ' '.join(info.split()[1:])
-                unused_items.append(f"{repo_tag_part} ({size_token})")
-                # unused_items.append(f"{info} ({size_token})")
+                unused_images.append({
+                    "id": image_id,
+                    "tags": [' '.join(info.split()[1:])],
+                    "size_bytes": int(parse_size(size_token) * 1024 * 1024),
+                })
 
     # Stopped containers
     stopped_raw = run_cmd("docker ps -a -f status=exited --format '{{.ID}} {{.Names}}'")
     stopped_lines = [l for l in stopped_raw.splitlines() if l.strip()]
 
-    stopped_total_mb = 0.0
-    stopped_items = []
+    stopped_containers = []
     for line in stopped_lines:
         cid, name = line.split(maxsplit=1) if " " in line else (line, line)
         size_bytes = run_cmd(f"docker inspect --size --format '{{{{.SizeRw}}}}' {cid}").strip()
-        size_str = "?"
-        if size_bytes and size_bytes.isdigit():
-            stopped_total_mb += int(size_bytes) / (1024.0 * 1024.0)
-            size_str = f"{int(size_bytes)/(1024*1024):.1f}MB"
-        stopped_items.append(f"{cid} {name} ({size_str})")
+        stopped_containers.append({
+            "id": cid,
+            "name": name,
+            "size_bytes": int(size_bytes) if size_bytes.isdigit() else None,
+        })
 
-    reclaim_mb = unused_total_mb + stopped_total_mb
+    unused_bytes = sum(i["size_bytes"] for i in unused_images)
+    stopped_bytes = sum(c["size_bytes"] or 0 for c in stopped_containers)
+    return {
+        "unused_images": unused_images,
+        "stopped_containers": stopped_containers,
+        "unused_images_bytes": unused_bytes,
+        "stopped_containers_bytes": stopped_bytes,
+        "reclaimable_bytes": unused_bytes + stopped_bytes,
+    }
 
-    def fmt_mb(mb):
-        return f"{mb/1024:.2f}GB" if mb >= 1024 else f"{mb:.1f}MB"
+def fmt_mb(mb):
+    return f"{mb/1024:.2f}GB" if mb >= 1024 else f"{mb:.1f}MB"
+
+# how the unused image total was counted, shown next to it
+ACCOUNTING_NOTES = {"layers": " (shared layers counted once)", "unique-size": " (at least: shared layers left out)"}
+
+def format_housekeeping(housekeeping):
+    """Build the Docker Housekeeping section from collect_housekeeping's numbers."""
+    unused_items = [
+        f"{', '.join(i['tags'])} ({docker_size(i['size_bytes'])}, frees {docker_size(i['freed_bytes'])})" if "freed_bytes" in i
+        else f"{', '.join(i['tags'])} ({docker_size(i['size_bytes'])})"
+        for i in housekeeping["unused_images"]
+    ]
+    stopped_items = [
+        f"{c['id']} {c['name']} ({c['size_bytes']/(1024*1024):.1f}MB)" if c["size_bytes"] is not None else f"{c['id']} {c['name']} (?)"
+        for c in housekeeping["stopped_containers"]
+    ]
+    unused_total_mb = housekeeping["unused_images_bytes"] / (1024.0 * 1024.0)
+    stopped_total_mb = housekeeping["stopped_containers_bytes"] / (1024.0 * 1024.0)
+    reclaim_mb = unused_total_mb + stopped_total_mb
 
     reclaim_str = (
         f"\nestimated total reclaimable space: {fmt_mb(reclaim_mb)}\n"
-        f"unused images: {fmt_mb(unused_total_mb)}\n"
+        f"unused images: {fmt_mb(unused_total_mb)}{ACCOUNTING_NOTES.get(housekeeping.get('accounting'), '')}\n"
         f"stopped containers: {fmt_mb(stopped_total_mb)}"
     )
 
@@ -197,15 +1112,15 @@ def get_docker_housekeeping():
         "Suggestion": suggestion
     }
 
-def print_table(title, rows, color=CYAN):
-    """Print a section with aligned columns and colors."""
-    print(f"\n{color}=== {title} ==={RESET}")
+def format_table(title, rows, color=CYAN):
+    """Lay out a section with aligned columns and colors, as a list of lines (the first one blank)."""
+    lines = ["", f"{color}=== {title} ==={RESET}"]
     if isinstance(rows, dict):
         for k, v in rows.items():
             if v and k == "Suggestion":
-                print(f"{YELLOW}{k:<20}:{RESET} {WHITE}{v}{RESET}")
+                lines.append(f"{YELLOW}{k:<20}:{RESET} {WHITE}{v}{RESET}")
             elif v:
-                print(f"{YELLOW}{k:<20}:{RESET} {WHITE}{v}{RESET}")
+                lines.append(f"{YELLOW}{k:<20}:{RESET} {WHITE}{v}{RESET}")
     else:
         split_rows = [r.split("\t") for r in rows]
         col_widths = [max(len(col) for col in column) for column in zip(*split_rows)]
@@ -216,7 +1131,12 @@ def print_table(title, rows, color=CYAN):
                     colored.append(f"{YELLOW}{col.ljust(col_widths[j])}{RESET}")
                 else:
                     colored.append(f"{WHITE}{col.ljust(col_widths[j])}{RESET}")
-            print("  ".join(colored))
+            lines.append("  ".join(colored))
+    return lines
+
+def print_table(title, rows, color=CYAN):
+    """Print a section with aligned columns and colors."""
+    print("\n".join(format_table(title, rows, color)))
 
 def print_header():
     """Print script header."""
@@ -231,18 +1151,915 @@ def print_header():
     print(f"{MAGENTA}    ╚══════════════════════════════════════════════════════════════════╝{RESET}")
 
 
-def main():
-    os.system("clear")  # clear screen at start
-    ec2_metrics = get_ec2_metrics()
-    ebs_volume = get_ebs_volume()
-    container_metrics = get_container_metrics()
-    docker_housekeeping = get_docker_housekeeping()
+# report sections: (title, collector, timeout in seconds)
+SECTIONS = [
+    ("EC2 Host Metrics", get_ec2_metrics, 5),
+    ("Attached EBS Volume (root)", lambda: [get_ebs_volume()], 5),
+    ("Docker Containers", get_container_metrics, 20),
+    ("Docker Housekeeping", get_docker_housekeeping, 30),
+]
+
+def run_collectors(sections):
+    """
+    Run every section's collector concurrently, each with its own timeout.
+    Returns {title: (status, value)} where status is "ok", "error" or "timeout",
+    so the report takes as long as the slowest collector rather than the sum of them.
+    """
+    results = {}
+
+    def run(title, collector):
+        try:
+            with span(f"collector: {title}"):
+                results[title] = ("ok", collector())
+        except Exception as e:
+            results[title] = ("error", e)
+
+    # daemon threads: a collector stuck past its timeout must not keep the script from exiting
+    threads = []
+    for title, collector, timeout in sections:
+        thread = threading.Thread(target=run, args=(title, collector), daemon=True)
+        thread.start()
+        threads.append((title, thread, timeout))
+    start = time.monotonic()
+    for title, thread, timeout in threads:
+        thread.join(max(0.0, start + timeout - time.monotonic()))
+        if thread.is_alive():
+            results[title] = ("timeout", timeout)
+    return {title: results[title] for title, _, _ in sections}
+
+def format_section(title, status, value):
+    """Lay out a collected section, or a partial marker for one that failed or timed out."""
+    if status == "ok":
+        return format_table(title, value)
+    if status == "timeout":
+        return format_table(f"{title} (partial)", {"Status": f"{RED}timed out after {value}s{RESET}"})
+    return format_table(f"{title} (partial)", {"Status": f"{RED}failed: {value}{RESET}"})
+
+def print_section(title, status, value):
+    """Print a collected section, or a partial marker for one that failed or timed out."""
+    print("\n".join(format_section(title, status, value)))
+
+# machine-readable snapshot sections: (name, typed collector, timeout in seconds)
+SNAPSHOT_SECTIONS = [
+    ("host", get_host_metrics, 5),
+    ("containers", collect_docker_containers, 20),
+    ("housekeeping", collect_docker_housekeeping, 30),
+]
+
+def collect_snapshot(sections=SNAPSHOT_SECTIONS):
+    """
+    Collect the typed metrics behind the report into one JSON-serialisable dict.
+    A section that failed or timed out is None, with the reason in "errors".
+    """
+    started = time.time()
+    results = run_collectors(sections)
+    snapshot = {
+        "hostname": socket.gethostname(),
+        "timestamp": started,
+        "collection_seconds": round(time.time() - started, 3),
+        "status": {},
+        "errors": {},
+    }
+    for name, (status, value) in results.items():
+        snapshot["status"][name] = status
+        snapshot[name] = value if status == "ok" else None
+        if status == "timeout":
+            snapshot["errors"][name] = f"timed out after {value}s"
+        elif status == "error":
+            snapshot["errors"][name] = str(value)
+    return snapshot
+
+def format_json(snapshot):
+    return json.dumps(snapshot, indent=2) + "\n"
+
+def prometheus_labels(**labels):
+    """Render {name="value",...} with the escaping the exposition format requires."""
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}" if labels else ""
+
+def format_prometheus(snapshot):
+    """Render a snapshot in the Prometheus text exposition format."""
+    metrics = {}  # name -> (type, help, [(labels, value)]), in order of first use
+
+    def add(metric, kind, help_text, value, labels=None):
+        if value is None:
+            return
+        metrics.setdefault(metric, (kind, help_text, []))[2].append((prometheus_labels(**(labels or {})), value))
+
+    for section, status in snapshot["status"].items():
+        add("resource_check_section_up", "gauge", "Whether the section was collected (1) or failed or timed out (0).",
+            1 if status == "ok" else 0, {"section": section})
+    add("resource_check_snapshot_timestamp_seconds", "gauge", "When the snapshot was taken.", snapshot["timestamp"])
+    add("resource_check_collection_seconds", "gauge", "How long collecting the snapshot took.", snapshot["collection_seconds"])
+
+    host = snapshot.get("host")
+    if host:
+        for period in ("1m", "5m", "15m"):
+            add("resource_check_load_average", "gauge", "System load average.", host[f"load_{period}"], {"period": period})
+        for state in ("total", "used", "available"):
+            add(f"resource_check_memory_{state}_bytes", "gauge", f"Host memory {state}.", host[f"mem_{state}_bytes"])
+        disk = {"device": host["disk_source"], "mount": host["disk_mount"]}
+        for state in ("size", "used", "available"):
+            add(f"resource_check_disk_{state}_bytes", "gauge", f"Root filesystem {state}.", host[f"disk_{state}_bytes"], disk)
+
+    for c in snapshot.get("containers") or []:
+        container = {"id": c["id"][:12], "name": c["name"], "image": c["image"]}
+        add("resource_check_container_cpu_percent", "gauge", "Container CPU use, 100 per core.", c["cpu_pct"], container)
+        add("resource_check_container_memory_used_bytes", "gauge", "Container memory use, page cache left out.", c["mem_used_bytes"], container)
+        add("resource_check_container_memory_limit_bytes", "gauge", "Container memory limit.", c["mem_limit_bytes"], container)
+        add("resource_check_container_io_read_bytes_total", "counter", "Bytes read from block devices.", c["io_read_bytes"], container)
+        add("resource_check_container_io_write_bytes_total", "counter", "Bytes written to block devices.", c["io_write_bytes"], container)
+
+    housekeeping = snapshot.get("housekeeping")
+    if housekeeping:
+        add("resource_check_docker_unused_images", "gauge", "Images no running container uses.", len(housekeeping["unused_images"]))
+        add("resource_check_docker_unused_images_bytes", "gauge", "Size of the unused images.", housekeeping["unused_images_bytes"])
+        add("resource_check_docker_stopped_containers", "gauge", "Exited containers.", len(housekeeping["stopped_containers"]))
+        add("resource_check_docker_stopped_containers_bytes", "gauge", "Writable layer size of the exited containers.", housekeeping["stopped_containers_bytes"])
+        add("resource_check_docker_reclaimable_bytes", "gauge", "Estimated space docker system prune -af would free.", housekeeping["reclaimable_bytes"])
+
+    lines = []
+    for name, (kind, help_text, samples) in metrics.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+OUTPUT_FORMATS = {"json": format_json, "prometheus": format_prometheus}
+
+
+class SnapshotCache:
+    """
+    The latest snapshot, rendered in every output format, refreshed by one background thread.
+    Scrapes are answered from it, so any number of scrapers cost one collection per refresh interval.
+    """
+
+    def __init__(self, refresh=15.0, collect=collect_snapshot):
+        self.refresh = refresh
+        self.collect = collect
+        self.rendered = None  # {format: text}
+        self.ready = threading.Event()
+        self.lock = threading.Lock()
+
+    def update(self):
+        snapshot = self.collect()
+        rendered = {name: render(snapshot) for name, render in OUTPUT_FORMATS.items()}
+        with self.lock:
+            self.rendered = rendered
+        self.ready.set()
+
+    def run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                self.update()
+            except Exception as e:  # keep serving the previous snapshot
+                print(f"{RED}snapshot refresh failed: {e}{RESET}", file=sys.stderr)
+            time.sleep(max(0.0, self.refresh - (time.monotonic() - started)))
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+    def get(self, output_format, wait=30.0):
+        """The latest rendering in output_format, or None if there is none yet after waiting wait seconds."""
+        if not self.ready.wait(wait):
+            return None
+        with self.lock:
+            return self.rendered[output_format]
+
+
+class SnapshotHandler(BaseHTTPRequestHandler):
+    """Serves the cached snapshot: /metrics for Prometheus, /json (or /) for JSON."""
+
+    routes = {
+        "/metrics": ("prometheus", "text/plain; version=0.0.4; charset=utf-8"),
+        "/json": ("json", "application/json"),
+        "/": ("json", "application/json"),
+    }
+    cache = None
+
+    def do_GET(self):
+        route = self.routes.get(self.path.split("?", 1)[0])
+        if route is None:
+            self.send_error(404)
+            return
+        body = self.cache.get(route[0])
+        if body is None:
+            self.send_error(503, "no snapshot collected yet")
+            return
+        body = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", route[1])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(address, refresh=15.0):
+    """Serve the latest snapshot over HTTP on HOST:PORT until interrupted."""
+    host, _, port = address.rpartition(":")
+    cache = SnapshotCache(refresh).start()
+    handler = type("Handler", (SnapshotHandler,), {"cache": cache})
+    server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), handler)
+    print(f"Serving http://{host or '127.0.0.1'}:{port}/metrics and /json, refreshed every {refresh:g}s", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+class RingBuffer:
+    """Fixed-size circular buffer of floats in an array('d'): appending never allocates once it is full."""
+
+    def __init__(self, size):
+        self.data = array("d", bytes(8 * size))
+        self.size = size
+        self.head = 0  # where the next value goes
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def latest(self, back=0):
+        """The newest value, or the one back samples before it."""
+        return self.data[(self.head - 1 - back) % self.size]
+
+    def values(self):
+        """All retained values, oldest first."""
+        start = (self.head - self.count) % self.size
+        return [self.data[(start + i) % self.size] for i in range(self.count)]
+
+
+class Series:
+    """Named ring buffers sampled together, with the sample times alongside."""
+
+    def __init__(self, fields, size):
+        self.times = RingBuffer(size)
+        self.fields = {field: RingBuffer(size) for field in fields}
+
+    def __len__(self):
+        return len(self.times)
+
+    def add(self, timestamp, values):
+        self.times.append(timestamp)
+        for field, buffer in self.fields.items():
+            buffer.append(values[field])
+
+    def latest(self, field):
+        return self.fields[field].latest() if len(self) else None
+
+    def delta(self, field, back=1):
+        """Change of a cumulative counter over the last back samples (fewer if not that many yet), or None."""
+        back = min(back, len(self) - 1)
+        if back < 1:
+            return None
+        buffer = self.fields[field]
+        return buffer.latest() - buffer.latest(back)
+
+    def rate(self, field, back=1):
+        """Per-second rate of a cumulative counter over the last back samples, or None."""
+        change = self.delta(field, back)
+        elapsed = self.delta_time(back)
+        return change / elapsed if change is not None and elapsed else None
+
+    def delta_time(self, back=1):
+        back = min(back, len(self) - 1)
+        return self.times.latest() - self.times.latest(back) if back >= 1 else None
+
+
+# container table orders: sort key per name (busiest / largest first, ties by name)
+CONTAINER_SORTS = {
+    "name": lambda row: row["name"],
+    "cpu": lambda row: (-(row["cpu_pct"] or 0.0), row["name"]),
+    "mem": lambda row: (-(row["mem_used"] or 0.0), row["name"]),
+}
+HOST_SERIES_FIELDS = ["cpu_busy", "cpu_total", "disk_read", "disk_write", "net_rx", "net_tx", "mem_used", "mem_total", "load_1m"]
+CONTAINER_SERIES_FIELDS = ["cpu_usage_usec", "mem_used", "mem_limit", "io_read", "io_write"]
+
+
+class Monitor:
+    """
+    Samples host and container metrics into ring buffers of the last samples readings.
+    CPU % comes from /proc/stat (and cpu.stat per container) deltas, disk and network figures are rates.
+    Memory stays flat however long it runs: the buffers are preallocated, and those of containers that
+    have gone away are dropped.
+    """
+
+    def __init__(self, samples=300, client=None, proc_root=PROC_ROOT, cgroup_root=CGROUP_ROOT):
+        self.samples = samples
+        self.client = client
+        self.proc_root = proc_root
+        self.cgroup_root = cgroup_root
+        self.host = Series(HOST_SERIES_FIELDS, samples)
+        self.containers = {}  # container id -> {"name": ..., "series": Series}
+        self.docker_cli = None  # whether the docker CLI fallback reaches a daemon, None until it has been needed
+
+    def sample(self):
+        with span("monitor: sample"):
+            self._sample()
+
+    def _sample(self):
+        now = time.monotonic()
+        self.sample_host(now)
+        self.sample_containers(now, self.host.latest("mem_total"))
+
+    def sample_host(self, now):
+        cpu_busy, cpu_total = read_cpu_times(self.proc_root)
+        disk_read, disk_write = read_diskstats(self.proc_root)
+        net_rx, net_tx = read_net_dev(self.proc_root)
+        meminfo = read_meminfo(self.proc_root)
+        mem_total = meminfo.get("MemTotal", 0)
+        self.host.add(now, {
+            "cpu_busy": cpu_busy, "cpu_total": cpu_total,
+            "disk_read": disk_read, "disk_write": disk_write,
+            "net_rx": net_rx, "net_tx": net_tx,
+            "mem_used": mem_total - meminfo.get("MemAvailable", meminfo.get("MemFree", 0)),
+            "mem_total": mem_total,
+            "load_1m": read_loadavg(self.proc_root)[0],
+        })
+
+    def list_running(self):
+        """Running containers from the API, else from docker ps, which is given up on once it has failed."""
+        if self.client is not None:
+            try:
+                return list_containers(self.client)
+            except (OSError, http.client.HTTPException, ValueError, DockerAPIError):
+                pass
+        if self.docker_cli is False:
+            return []
+        running = list_containers(None)
+        if self.docker_cli is None:  # docker ps prints nothing both when idle and when failing, so ask once
+            self.docker_cli = bool(running) or docker_cli_reachable()
+        return running
+
+    def sample_containers(self, now, mem_total):
+        running = self.list_running()
+        seen = set()
+        for container in running:
+            cgroup_dir = container_cgroup_dir(container["id"], self.cgroup_root)
+            if cgroup_dir is None:
+                continue
+            try:
+                stats = read_cgroup_stats(cgroup_dir)
+            except (OSError, ValueError):
+                continue
+            entry = self.containers.get(container["id"])
+            if entry is None:
+                entry = self.containers[container["id"]] = {"series": Series(CONTAINER_SERIES_FIELDS, self.samples)}
+            entry["name"] = container["name"]
+            entry["series"].add(now, {
+                "cpu_usage_usec": stats["cpu_usage_usec"],
+                "mem_used": stats["memory_used_bytes"],
+                "mem_limit": stats["memory_max_bytes"] or mem_total,
+                "io_read": stats["io_read_bytes"],
+                "io_write": stats["io_write_bytes"],
+            })
+            seen.add(container["id"])
+        for container_id in set(self.containers) - seen:
+            del self.containers[container_id]
+
+    def host_cpu_pct(self, back=1):
+        total = self.host.delta("cpu_total", back)
+        return self.host.delta("cpu_busy", back) * 100.0 / total if total else None
+
+    def host_rows(self):
+        """The host section as a print_table dict."""
+        host = self.host
+
+        def rate(field):
+            value = host.rate(field)
+            return f"{docker_size(value)}/s" if value is not None else "-"
+
+        cpu_now, cpu_window = self.host_cpu_pct(), self.host_cpu_pct(len(host) - 1)
+        mem_used, mem_total = host.latest("mem_used"), host.latest("mem_total")
+        window = host.delta_time(len(host) - 1)
+        return {
+            "CPU Used": f"{cpu_now:.1f}% (window avg {cpu_window:.1f}% over {window:.0f}s)" if cpu_now is not None else "-",
+            "CPU Load (1m)": f"{host.latest('load_1m'):.2f}",
+            "Memory Used": f"{human_size(mem_used)} / {human_size(mem_total)} ({mem_used * 100.0 / mem_total:.1f}%)" if mem_total else "-",
+            "Disk Read / Write": f"{rate('disk_read')} / {rate('disk_write')}",
+            "Network Rx / Tx": f"{rate('net_rx')} / {rate('net_tx')}",
+        }
+
+    def container_stats(self):
+        """The latest figures per container, as dicts for format_container_rows."""
+        rows = []
+        for container_id, entry in self.containers.items():
+            series = entry["series"]
+            cpu_usec, elapsed = series.delta("cpu_usage_usec"), series.delta_time()
+            rows.append({
+                "id": container_id, "name": entry["name"],
+                "cpu_pct": cpu_usec * 100.0 / (elapsed * 1e6) if cpu_usec is not None and elapsed else None,
+                "mem_used": series.latest("mem_used"), "mem_limit": series.latest("mem_limit"),
+                "read_rate": series.rate("io_read"), "write_rate": series.rate("io_write"),
+            })
+        return rows
+
+    def container_rows(self, sort="name"):
+        """The containers section as print_table rows, ordered by CONTAINER_SORTS[sort]."""
+        return format_container_rows(self.container_stats(), sort)
+
+def format_container_rows(stats, sort="name"):
+    """Monitor.container_stats as print_table rows, ordered by CONTAINER_SORTS[sort]."""
+    lines = ["\t".join(["CONTAINER ID", "NAME", "CPU %", "MEM USAGE / LIMIT", "MEM %", "READ", "WRITE"])]
+    for row in sorted(stats, key=CONTAINER_SORTS[sort]):
+        mem_used, mem_limit = row["mem_used"], row["mem_limit"]
+        lines.append("\t".join([
+            row["id"][:12], row["name"],
+            f"{row['cpu_pct']:.2f}%" if row["cpu_pct"] is not None else "-",
+            f"{docker_size(mem_used)} / {docker_size(mem_limit)}",
+            f"{mem_used * 100.0 / mem_limit:.2f}%" if mem_limit else "-",
+            f"{docker_size(row['read_rate'])}/s" if row["read_rate"] is not None else "-",
+            f"{docker_size(row['write_rate'])}/s" if row["write_rate"] is not None else "-",
+        ]))
+    return lines
+
+def monitor(interval=2.0, samples=300, iterations=None):
+    """Redraw host and container metrics every interval seconds until interrupted (or for iterations samples)."""
+    mon = Monitor(samples, client=docker_client())
+    next_tick = time.monotonic()
+    taken = 0
+    try:
+        while iterations is None or taken < iterations:
+            mon.sample()
+            taken += 1
+            print("\033[H\033[2J", end="")  # cursor home + clear, like clear(1) without spawning it
+            print_header()
+            print(f"{ITALICS}sampling every {interval:g}s, keeping the last {samples} samples; Ctrl-C to stop{RESET}")
+            print_table("EC2 Host Metrics", mon.host_rows())
+            if mon.containers:
+                print_table("Docker Containers (cgroup v2)", mon.container_rows())
+            sys.stdout.flush()
+            next_tick += interval
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    return mon
+
+# --dashboard: seconds between refreshes per section. Host metrics (read from /proc) follow --interval,
+# container stats come from cgroup files, the docker-wide sections are the expensive ones.
+DASHBOARD_CADENCES = {
+    "containers": 2.0,
+    "Attached EBS Volume (root)": 60.0,
+    "Docker Housekeeping": 300.0,
+}
+DASHBOARD_KEYS = {"c": "cpu", "m": "mem", "n": "name"}  # key -> container sort
+SGR_PATTERN = re.compile(r"\033\[([0-9;]*)m")
+
+
+class Screen:
+    """
+    The terminal as a grid of (character, color) cells, drawn on the alternate screen.
+    draw() compares a frame with what is already on screen and rewrites only the runs of cells that
+    changed, moving the cursor to each, so a refresh where a few numbers moved costs a few dozen bytes
+    and nothing flickers. A resize clears the screen and repaints it in full.
+    """
+
+    def __init__(self, out=sys.stdout):
+        self.out = out
+        self.size = None
+        self.cells = []
+
+    def __enter__(self):
+        self.out.write("\033[?1049h\033[?25l")  # alternate screen, hide the cursor
+        self.out.flush()
+        return self
+
+    def __exit__(self, *exc):
+        self.out.write("\033[0m\033[?25h\033[?1049l")
+        self.out.flush()
+
+    @staticmethod
+    def to_cells(line, width, style=""):
+        """
+        Split a line with color codes into exactly width cells, each carrying the codes in effect.
+        Returns the cells and the codes still in effect at the end of the line.
+        """
+        cells, pos = [], 0
+        for match in SGR_PATTERN.finditer(line):
+            cells.extend((ch if ch >= " " else " ", style) for ch in line[pos:match.start()])
+            style = "" if match.group(1) in ("", "0") else style + match.group(0)
+            pos = match.end()
+        cells.extend((ch if ch >= " " else " ", style) for ch in line[pos:])
+        del cells[width:]
+        cells.extend([(" ", "")] * (width - len(cells)))
+        return cells, style
+
+    def draw(self, lines):
+        width, height = shutil.get_terminal_size()
+        parts = []
+        if (width, height) != self.size:
+            self.size = (width, height)
+            self.cells = [[(" ", "")] * width for _ in range(height)]
+            parts.append("\033[0m\033[2J")
+        frame = []
+        for line in lines:
+            style = ""
+            for part in line.split("\n"):  # multi-line values keep their color on the following lines
+                cells, style = self.to_cells(part, width, style)
+                frame.append(cells)
+        del frame[height:]
+        frame.extend([[(" ", "")] * width for _ in range(height - len(frame))])
+        style = None
+        for y, (old, new) in enumerate(zip(self.cells, frame)):
+            if old == new:
+                continue
+            x = 0
+            while x < width:
+                if old[x] == new[x]:
+                    x += 1
+                    continue
+                # one cursor move per run; gaps of a few unchanged cells are cheaper to rewrite than to jump
+                end = x + 1
+                while end < width and (old[end] != new[end] or any(a != b for a, b in zip(old[end:end + 6], new[end:end + 6]))):
+                    end += 1
+                parts.append(f"\033[{y + 1};{x + 1}H")
+                for ch, cell_style in new[x:end]:
+                    if cell_style != style:
+                        parts.append("\033[0m" + cell_style)
+                        style = cell_style
+                    parts.append(ch)
+                x = end
+        self.cells = frame
+        if parts:
+            data = "".join(parts) + "\033[0m"
+            count("dashboard bytes written", len(data))
+            self.out.write(data)
+            self.out.flush()
+
+
+class Keyboard:
+    """Single key presses from the terminal (cbreak mode, so Ctrl-C still works), restored on exit."""
+
+    def __init__(self, stream=sys.stdin):
+        self.fd = stream.fileno() if stream.isatty() else None
+        self.saved = None
+
+    def __enter__(self):
+        if self.fd is not None:
+            self.saved = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, *exc):
+        if self.saved is not None:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved)
+
+    def read(self, timeout):
+        """Wait up to timeout seconds and return the keys pressed meanwhile ("" if none)."""
+        if self.fd is None:
+            time.sleep(timeout)
+            return ""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        return os.read(self.fd, 64).decode(errors="ignore") if ready else ""
+
+
+def dashboard_lines(mon, slow, sort, interval, cadences=DASHBOARD_CADENCES):
+    """The dashboard frame: a status line, then host, containers and the slow sections, as lines."""
+    now = time.monotonic()
+    lines = [f"{MAGENTA}{BOLD}Docker Resource Check{RESET}  {WHITE}{socket.gethostname()}  {datetime.now():%H:%M:%S}{RESET}"
+             f"   sort: {GREEN}{sort}{RESET}   {ITALICS}[c]pu [m]em [n]ame [q]uit{RESET}"]
+    lines += format_table(f"EC2 Host Metrics (every {interval:g}s)", mon.host_rows())
+    title = f"Docker Containers (cgroup v2, every {cadences['containers']:g}s, by {sort})"
+    if "containers" not in slow:
+        lines += format_table(f"{title} (collecting...)", {})
+    else:
+        status, stats, _ = slow["containers"]
+        if status == "ok" and not stats:
+            stats = {"Status": "docker is not reachable" if mon.docker_cli is False else "no running containers"}
+        elif status == "ok":
+            stats = format_container_rows(stats, sort)
+        lines += format_section(title, status, stats)
+    for title, _, _ in SECTIONS:
+        if title not in cadences:
+            continue
+        if title not in slow:
+            lines += format_table(f"{title} (collecting...)", {})
+            continue
+        status, value, collected = slow[title]
+        lines += format_section(f"{title} ({now - collected:.0f}s ago, every {cadences[title]:g}s)", status, value)
+    return lines
+
+def dashboard(interval=2.0, samples=300, sort="cpu", cadences=DASHBOARD_CADENCES):
+    """
+    Live view of host, containers and the slow report sections, each refreshed on its own cadence,
+    until q or Ctrl-C. Everything but the /proc host figures is collected on background threads, and
+    drawn from its last completed result, so a slow or hung daemon never holds up a redraw or a key.
+    """
+    mon = Monitor(samples, client=docker_client())
+    slow = {}  # section title -> (status, value, monotonic time collected)
+
+    def collect(title, collector):
+        try:
+            with span(f"collector: {title}"):
+                slow[title] = ("ok", collector(), time.monotonic())
+        except Exception as e:
+            slow[title] = ("error", e, time.monotonic())
+
+    def refresh(section, cadence):
+        # like run_collectors, but a collector still hung from an earlier round is waited for, not joined by another
+        title, collector, timeout = section
+        worker = None
+        while True:
+            if worker is None or not worker.is_alive():
+                worker = threading.Thread(target=collect, args=(title, collector), daemon=True)
+                worker.start()
+                worker.join(timeout)
+                if worker.is_alive():
+                    slow[title] = ("timeout", timeout, time.monotonic())
+            time.sleep(cadence)
+
+    def refresh_containers(cadence):
+        # only this thread touches mon.containers; the screen gets a finished list of figures
+        while True:
+            try:
+                with span("dashboard: containers"):
+                    mon.sample_containers(time.monotonic(), read_meminfo(mon.proc_root).get("MemTotal", 0))
+                    slow["containers"] = ("ok", mon.container_stats(), time.monotonic())
+            except Exception as e:
+                slow["containers"] = ("error", e, time.monotonic())
+            time.sleep(cadence)
+
+    threading.Thread(target=refresh_containers, args=(cadences["containers"],), daemon=True).start()
+    for section in SECTIONS:
+        if section[0] in cadences:
+            threading.Thread(target=refresh, args=(section, cadences[section[0]]), daemon=True).start()
+
+    next_host = time.monotonic()
+    try:
+        with Keyboard() as keys, Screen() as screen:
+            while True:
+                now = time.monotonic()
+                if now >= next_host:
+                    mon.sample_host(now)
+                    next_host = max(next_host + interval, now)
+                with span("dashboard: draw"):
+                    screen.draw(dashboard_lines(mon, slow, sort, interval, cadences))
+                wait = min(next_host - time.monotonic(), cadences["containers"])  # containers show up within a cadence
+                for key in keys.read(max(0.0, wait)).lower():
+                    if key == "q":
+                        return mon
+                    sort = DASHBOARD_KEYS.get(key, sort)
+    except KeyboardInterrupt:
+        pass
+    return mon
+
+# fleet mode: hosts given as http(s) URLs are asked for their --serve JSON endpoint, anything else goes through this command
+FLEET_COMMAND = ("ssh -o BatchMode=yes -o ControlMaster=auto -o ControlPath=~/.ssh/resource-check-%C -o ControlPersist=60 "
+                 "{host} python3 - --format json")  # this script is piped to the remote python3 on stdin
+FLEET_JOBS = 16  # hosts queried at once
+FLEET_TIMEOUT = 60  # seconds per host
+
+
+class HTTPConnectionPool:
+    """Keep-alive HTTP(S) connections per host:port, shared by the fleet workers."""
+
+    def __init__(self, timeout=FLEET_TIMEOUT):
+        self.timeout = timeout
+        self.idle = {}  # (scheme, netloc) -> [connection]
+        self.lock = threading.Lock()
+
+    def get_json(self, url):
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path if parts.path not in ("", "/") else "/json") + (f"?{parts.query}" if parts.query else "")
+        for attempt in (1, 2):  # a kept-alive connection may have been closed by the agent meanwhile
+            with self.lock:
+                conn = self.idle.get(key, []).pop() if self.idle.get(key) else None
+            if conn is None:
+                connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+                conn = connection_class(parts.netloc, timeout=self.timeout)
+            try:
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                body = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if attempt == 2:
+                    raise
+                continue
+            if resp.will_close:
+                conn.close()
+            else:
+                with self.lock:
+                    self.idle.setdefault(key, []).append(conn)
+            if resp.status != 200:
+                raise OSError(f"HTTP {resp.status} from {url}")
+            return json.loads(body)
+
+    def close(self):
+        with self.lock:
+            for connections in self.idle.values():
+                for conn in connections:
+                    conn.close()
+            self.idle.clear()
+
+def read_fleet_hosts(path):
+    """Hosts from a file (or "-" for stdin), one per line; blank lines and # comments are skipped."""
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def fetch_snapshot_by_command(host, command=FLEET_COMMAND, timeout=FLEET_TIMEOUT, script=None):
+    """Run command for host with this script on its stdin, and parse the JSON snapshot it prints."""
+    if script is None:
+        with open(os.path.abspath(__file__)) as f:
+            script = f.read()
+    proc = subprocess.Popen(shlex.split(command.format(host=host)), text=True, start_new_session=True,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        output, errors = proc.communicate(script, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(proc.pid, signal.SIGKILL)
+        proc.communicate()
+        raise OSError(f"timed out after {timeout}s")
+    if proc.returncode != 0:
+        raise OSError(errors.strip().splitlines()[-1] if errors.strip() else f"exit status {proc.returncode}")
+    return json.loads(output)
+
+def collect_fleet(hosts, command=FLEET_COMMAND, jobs=FLEET_JOBS, timeout=FLEET_TIMEOUT):
+    """
+    Snapshots from every host, at most jobs at a time.
+    Returns [{"host": ..., "snapshot": dict or None, "error": str or None}] in the order of hosts.
+    """
+    pool = HTTPConnectionPool(timeout)
+    with open(os.path.abspath(__file__)) as f:
+        script = f.read()
+
+    def fetch(host):
+        try:
+            with span(f"fleet: {host}"):
+                if host.startswith(("http://", "https://")):
+                    snapshot = pool.get_json(host)
+                else:
+                    snapshot = fetch_snapshot_by_command(host, command, timeout, script)
+            return {"host": host, "snapshot": snapshot, "error": None}
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            return {"host": host, "snapshot": None, "error": str(e) or e.__class__.__name__}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(hosts)))) as executor:
+            return list(executor.map(fetch, hosts))
+    finally:
+        pool.close()
+
+def host_summary(snapshot):
+    """The figures hosts are ranked by, from one snapshot (None where the section is missing)."""
+    host = snapshot.get("host") or {}
+    housekeeping = snapshot.get("housekeeping") or {}
+    containers = snapshot.get("containers")
+    mem_total = host.get("mem_total_bytes")
+    return {
+        "reclaimable_bytes": housekeeping.get("reclaimable_bytes"),
+        "memory_pct": host["mem_used_bytes"] * 100.0 / mem_total if mem_total else None,
+        "disk_pct": host.get("disk_use_pct"),
+        "load_1m": host.get("load_1m"),
+        "containers": len(containers) if containers is not None else None,
+        "container_cpu_pct": sum(c["cpu_pct"] or 0 for c in containers) if containers else None,
+    }
+
+# --rank choices: summary field hosts are sorted by, highest first
+FLEET_RANKINGS = {
+    "reclaimable": "reclaimable_bytes",
+    "memory": "memory_pct",
+    "disk": "disk_pct",
+    "load": "load_1m",
+    "cpu": "container_cpu_pct",
+}
+
+def rank_fleet(results, rank="reclaimable"):
+    """Reachable hosts ranked by the chosen figure, highest first, each with its summary; unknown figures go last."""
+    field = FLEET_RANKINGS[rank]
+    ranked = [dict(result, summary=host_summary(result["snapshot"])) for result in results if result["snapshot"]]
+    ranked.sort(key=lambda r: (r["summary"][field] is None, -(r["summary"][field] or 0)))
+    return ranked
+
+def get_fleet_report(results, rank="reclaimable"):
+    """The fleet section as print_table rows."""
+    header = ["#", "HOST", "RECLAIMABLE", "MEM %", "DISK %", "LOAD 1m", "CONTAINERS", "CONTAINER CPU %", "PARTIAL"]
+    rows = ["\t".join(header)]
+
+    def number(value, text):
+        return text.format(value) if value is not None else "-"
+
+    for position, result in enumerate(rank_fleet(results, rank), 1):
+        summary, snapshot = result["summary"], result["snapshot"]
+        rows.append("\t".join([
+            str(position), result["host"],
+            docker_size(summary["reclaimable_bytes"]) if summary["reclaimable_bytes"] is not None else "-",
+            number(summary["memory_pct"], "{:.1f}%"),
+            number(summary["disk_pct"], "{}%"),
+            number(summary["load_1m"], "{:.2f}"),
+            number(summary["containers"], "{}"),
+            number(summary["container_cpu_pct"], "{:.1f}%"),
+            ", ".join(sorted(snapshot.get("errors") or {})) or "-",
+        ]))
+    return rows
+
+def print_fleet_report(results, rank="reclaimable"):
+    print_header()
+    reachable = sum(1 for result in results if result["snapshot"])
+    print_table(f"Fleet: {reachable}/{len(results)} hosts, ranked by {rank}", get_fleet_report(results, rank))
+    unreachable = {result["host"]: f"{RED}{result['error']}{RESET}" for result in results if not result["snapshot"]}
+    if unreachable:
+        print_table("Unreachable Hosts", unreachable, color=RED)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Docker and host resource report.")
+    parser.add_argument("--monitor", action="store_true", help="keep sampling and redrawing instead of printing one report")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between samples in --monitor mode (default: %(default)s)")
+    parser.add_argument("--samples", type=int, default=300, help="samples kept per metric in --monitor mode (default: %(default)s)")
+    parser.add_argument("--dashboard", action="store_true", help="live view refreshing each section on its own cadence (keys: c/m/n sort containers, q quits)")
+    parser.add_argument("--sort", choices=list(CONTAINER_SORTS), default="cpu", help="container order in --dashboard (default: %(default)s)")
+    parser.add_argument("--format", choices=["table", "json", "prometheus"], default="table", help="output format (default: %(default)s)")
+    parser.add_argument("--serve", metavar="HOST:PORT", help="serve the latest snapshot over HTTP (/metrics, /json) instead of printing it")
+    parser.add_argument("--refresh", type=float, default=15.0, help="seconds between snapshot refreshes with --serve (default: %(default)s)")
+    parser.add_argument("--fleet", metavar="HOSTS_FILE", help="report on the hosts listed in HOSTS_FILE (- for stdin) instead of this one")
+    parser.add_argument("--fleet-command", default=FLEET_COMMAND, help="command run for non-URL hosts, {host} is substituted (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=FLEET_JOBS, help="hosts queried at once with --fleet (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=FLEET_TIMEOUT, help="seconds per host with --fleet (default: %(default)s)")
+    parser.add_argument("--rank", choices=list(FLEET_RANKINGS), default="reclaimable", help="what --fleet ranks hosts by (default: %(default)s)")
+    parser.add_argument("--du", nargs="*", metavar="ROOT", help=f"report the largest directories and files under ROOTs (default: {' '.join(DU_ROOTS)})")
+    parser.add_argument("--top", type=int, default=DU_TOP, help="entries in each --du list (default: %(default)s)")
+    parser.add_argument("--du-max-age", type=float, default=DU_CACHE_MAX_AGE, help="seconds before a cached directory is rescanned anyway (default: %(default)s)")
+    parser.add_argument("--profile", action="store_true", help="print where the time went (to stderr) after the run")
+    parser.add_argument("--profile-json", metavar="FILE", help="write the profile spans and counters to FILE as JSON")
+    args = parser.parse_args(argv)
+    if args.interval <= 0 or args.samples < 2:
+        parser.error("--interval must be positive and --samples at least 2")
+    if args.dashboard and not sys.stdout.isatty():
+        parser.error("--dashboard needs a terminal")
+    if args.serve and not args.serve.rpartition(":")[2].isdigit():
+        parser.error("--serve expects HOST:PORT")
+
+    if (args.fleet or args.du is not None) and args.format == "prometheus":
+        parser.error("--fleet and --du support the table and json formats")
+
+    if args.profile or args.profile_json:
+        enable_profiling()
+    try:
+        run(args)
+    finally:
+        if args.profile:
+            print_profile()
+        if args.profile_json:
+            dump_profile(args.profile_json)
+
+def run(args):
+    """Carry out the mode chosen on the command line."""
+
+    if args.du is not None:
+        report = analyze_disk_usage(args.du or DU_ROOTS, args.top, max_age=args.du_max_age)
+        if args.format == "json":
+            sys.stdout.write(json.dumps(report, indent=2) + "\n")
+        else:
+            summary, directories, files = get_disk_usage_report(report)
+            print_table("Disk Usage", summary)
+            print_table(f"Largest Directories (top {args.top})", directories)
+            print_table(f"Largest Files (top {args.top})", files)
+        return
+    if args.fleet:
+        results = collect_fleet(read_fleet_hosts(args.fleet), args.fleet_command, args.jobs, args.timeout)
+        if args.format == "json":
+            unreachable = [result for result in results if not result["snapshot"]]
+            report = {"rank": args.rank, "hosts": rank_fleet(results, args.rank), "unreachable": unreachable}
+            sys.stdout.write(json.dumps(report, indent=2) + "\n")
+        else:
+            print_fleet_report(results, args.rank)
+        return
+    if args.serve:
+        serve(args.serve, args.refresh)
+        return
+    if args.dashboard:
+        dashboard(args.interval, args.samples, args.sort)
+        return
+    if args.monitor:
+        monitor(args.interval, args.samples)
+        return
+    if args.format != "table":
+        sys.stdout.write(OUTPUT_FORMATS[args.format](collect_snapshot()))
+        return
+
+    print("\033[H\033[2J", end="")  # clear screen at start, without spawning clear(1)
+    results = run_collectors(SECTIONS)
 
     print_header()
-    print_table("EC2 Host Metrics", ec2_metrics)
-    print_table("Attached EBS Volume (root)", [ebs_volume])
-    print_table("Docker Containers", container_metrics)
-    print_table("Docker Housekeeping", docker_housekeeping)
+    for title, (status, value) in results.items():
+        print_section(title, status, value)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+# Python companion to github-variables-and-secrets-setup.sh, for many repos and many keys.
+# Reads the same config file, lists the variables and secrets each repo already has with a few paginated
+# API calls, works out what to create, update or leave alone, and applies only the changes, several requests
+# at a time over pooled keep-alive HTTPS connections. Rate limits are waited out rather than failed on.
+
+## Prerequisites:
+# - Python 3.8+
+# - PyYAML (optional: a minimal parser for the config's flat layout is built in)
+# - PyNaCl (only when secrets change: GitHub wants secret values encrypted with the repo's public key)
+# - A GitHub token with access to the repos and the necessary permissions.
+
+## How to use this script:
+# 1. Use the same "github-variables-and-secrets-config.yaml" as the bash script. REPO may also be a list,
+#    and an entry may be "owner/repo" to override ORG for that repo:
+    # authentication:
+        # ORG: "myorg"
+        # REPO:
+            # - "myrepo"
+            # - "otherorg/otherrepo"
+        # GITHUB_TOKEN: "ghp_****"     # or leave it out and export GITHUB_TOKEN
+
+# 2. Run the script:
+#    python3 github-variables-and-secrets-sync.py                      # show the plan, ask, apply
+#    python3 github-variables-and-secrets-sync.py --dry-run            # show the plan only
+#    python3 github-variables-and-secrets-sync.py --yes --jobs 16      # no questions, 16 requests at a time
+#    GITHUB_API_URL=http://127.0.0.1:8080 python3 github-variables-and-secrets-sync.py   # GHES or a fake API
+
+# Secret values can't be read back, so every configured secret that already exists is updated
+# (--skip-existing-secrets leaves them alone instead). Variable and secret names are matched the way
+# GitHub stores them, case-insensitively.
+
+import os
+import sys
+import json
+import time
+import queue
+import base64
+import argparse
+import threading
+import http.client
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    from nacl import encoding, public
+except ImportError:
+    public = None
+
+CONFIG_FILE = "github-variables-and-secrets-config.yaml"
+API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+API_VERSION = "2022-11-28"
+API_TIMEOUT = 30
+JOBS = 8
+MAX_RETRIES = 5
+IDEMPOTENT_METHODS = ("GET", "PUT", "PATCH", "DELETE")  # safe to resend after a lost response
+MAX_RATE_LIMIT_WAIT = 3600  # give up rather than sleep longer than this for a rate limit to reset
+
+# Largest page sizes the list endpoints accept
+VARIABLES_PER_PAGE = 30
+SECRETS_PER_PAGE = 100
+
+# Display widths, as in the bash script
+TRUNCATE_WIDTH = 40
+NAME_MIN, NAME_MAX = 12, 30
+VAL_MIN, VAL_MAX = 15, 40
+STATUS_WIDTH = 10
+
+# ANSI colors
+CYAN = "\033[96m"
+YELLOW = "\033[93m"
+GREEN = "\033[92m"
+RED = "\033[91m"
+BOLD = "\033[1m"
+RESET = "\033[0m"
+
+STATUS_COLORS = {"Create": GREEN, "Created": GREEN, "Update": YELLOW, "Updated": YELLOW, "Failed": RED}
+
+
+class SyncError(Exception):
+    """A problem with the config or the environment that stops the sync before anything is changed."""
+
+
+class GitHubAPIError(Exception):
+    """An API request that failed with an HTTP error status."""
+
+    def __init__(self, method, path, status, message):
+        super().__init__(f"{method} {path}: {status} {message}")
+        self.status = status
+
+
+# ---------------------------------------------------------------------------
+# Config
+# ---------------------------------------------------------------------------
+
+def parse_scalar(text):
+    """Decode a YAML scalar the way yq -r prints it: quotes removed, trailing comment dropped."""
+    text = text.strip()
+    if text.startswith('"'):
+        end = 1
+        while end < len(text) and text[end] != '"':
+            end += 2 if text[end] == "\\" else 1
+        return json.loads(text[:end + 1])
+    if text.startswith("'"):
+        end = 1
+        while end < len(text):
+            if text[end] == "'" and text[end + 1:end + 2] != "'":
+                break
+            end += 2 if text[end] == "'" else 1
+        return text[1:end].replace("''", "'")
+    if " #" in text:
+        text = text[:text.index(" #")].rstrip()
+    if text.startswith("[") and text.endswith("]"):
+        return [parse_scalar(item) for item in text[1:-1].split(",") if item.strip()]
+    return "" if text in ("", "~", "null") else text
+
+
+def parse_simple_yaml(text):
+    """Parse the config's layout without PyYAML: top-level sections of KEY: value pairs, values may be lists."""
+    config = {}
+    section = key = None
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if stripped.startswith("- ") or stripped == "-":
+            if section is None or key is None:
+                raise SyncError(f"line {number}: list item outside a key")
+            if not isinstance(config[section][key], list):
+                config[section][key] = []
+            config[section][key].append(parse_scalar(stripped[1:]))
+            continue
+        name, sep, value = stripped.partition(":")
+        if not sep:
+            raise SyncError(f"line {number}: expected 'KEY: value'")
+        name = parse_scalar(name)
+        if indent == 0:
+            section, key = name, None
+            config[section] = {}
+        elif section is None:
+            raise SyncError(f"line {number}: key outside a section")
+        else:
+            key = name
+            config[section][key] = parse_scalar(value)
+    return config
+
+
+def format_value(value):
+    """Render a config value the way yq -r would, so 'true' and 1 compare equal to what GitHub stores."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def load_config(path):
+    """Read the config file, returning (repos, token, variables, secrets)."""
+    try:
+        with open(path) as f:
+            text = f.read()
+    except OSError as e:
+        raise SyncError(f"cannot read {path}: {e.strerror}")
+    config = yaml.safe_load(text) if yaml else parse_simple_yaml(text)
+    config = config or {}
+    auth = config.get("authentication") or {}
+    org = format_value(auth.get("ORG")).strip()
+    names = auth.get("REPO") or []
+    if not isinstance(names, list):
+        names = [names]
+    repos = []
+    for name in (format_value(n).strip() for n in names):
+        if "/" not in name:
+            if not org:
+                raise SyncError(f"{path}: REPO {name!r} needs an ORG")
+            name = f"{org}/{name}"
+        repos.append(name)
+    if not repos:
+        raise SyncError(f"{path}: no REPO under authentication")
+    token = format_value(auth.get("GITHUB_TOKEN")) or os.environ.get("GITHUB_TOKEN", "")
+    variables = {str(k): format_value(v) for k, v in (config.get("variables") or {}).items()}
+    secrets = {str(k): format_value(v) for k, v in (config.get("secrets") or {}).items()}
+    return repos, token, variables, secrets
+
+
+# ---------------------------------------------------------------------------
+# GitHub REST API
+# ---------------------------------------------------------------------------
+
+class GitHubAPI:
+    """Minimal GitHub REST client over pooled keep-alive connections to one API host.
+
+    Requests are safe to make from several threads. When GitHub answers with a rate limit, every
+    thread holds off until the limit resets (or Retry-After passes) and the request is retried.
+    """
+
+    def __init__(self, api_url, token, timeout=API_TIMEOUT, pool_size=JOBS, max_retries=MAX_RETRIES):
+        parsed = urllib.parse.urlsplit(api_url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise SyncError(f"bad API URL: {api_url}")
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.requests = 0
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self._public_keys = {}
+
+    def _connection(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            if self.scheme == "https":
+                return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _wait_for_rate_limit(self):
+        with self._lock:
+            delay = self._resume_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _hold_off(self, delay):
+        """Make every thread wait delay seconds before its next request."""
+        if delay > MAX_RATE_LIMIT_WAIT:
+            return False
+        with self._lock:
+            first = self._resume_at <= time.time()
+            self._resume_at = max(self._resume_at, time.time() + delay)
+        if first and delay >= 5:
+            print(f"{YELLOW}Rate limited, waiting {delay:.0f}s...{RESET}", file=sys.stderr)
+        return True
+
+    @staticmethod
+    def _retry_delay(status, headers, body, attempt):
+        """Seconds to wait before retrying a failed response, or None if retrying won't help."""
+        if status in (403, 429):
+            retry_after = headers.get("retry-after")
+            if retry_after and retry_after.isdigit():
+                return int(retry_after)
+            if headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset", "").isdigit():
+                return max(int(headers["x-ratelimit-reset"]) - time.time(), 0) + 1
+            if status == 429 or b"secondary rate limit" in body.lower():
+                return 60 * 2 ** (attempt - 1)  # GitHub asks for at least a minute, then exponentially longer
+            return None
+        if status in (500, 502, 503, 504):
+            return 2 ** attempt
+        return None
+
+    def request(self, method, path, body=None):
+        """Send a request and return (decoded JSON body, response headers)."""
+        url = path if path.startswith(self.base_path + "/") and self.base_path else self.base_path + path
+        headers = {
+            "Accept": "application/vnd.github+json",
+            "X-GitHub-Api-Version": API_VERSION,
+            "User-Agent": "github-variables-and-secrets-sync",
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        for attempt in range(1, self.max_retries + 1):
+            self._wait_for_rate_limit()
+            conn = self._connection()
+            try:
+                conn.request(method, url, body=payload, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()  # a pooled connection may have been closed by the server meanwhile
+                # a POST may have landed before its response was lost, and a second one would fail as a duplicate
+                if attempt == self.max_retries or method not in IDEMPOTENT_METHODS:
+                    raise
+                continue
+            finally:
+                with self._lock:
+                    self.requests += 1
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+            if resp.status < 400:
+                return (json.loads(data) if data else None), resp_headers
+            delay = self._retry_delay(resp.status, resp_headers, data, attempt)
+            if delay is None or attempt == self.max_retries or not self._hold_off(delay):
+                try:
+                    message = json.loads(data).get("message", "")
+                except (ValueError, AttributeError):
+                    message = data[:200].decode(errors="replace")
+                raise GitHubAPIError(method, path, resp.status, message)
+
+    def _next_page(self, link):
+        """The path of the rel="next" entry in a Link header, or None on the last page."""
+        for part in link.split(","):
+            target, _, params = part.partition(";")
+            if 'rel="next"' in params:
+                parsed = urllib.parse.urlsplit(target.strip().strip("<>"))
+                return parsed.path + ("?" + parsed.query if parsed.query else "")
+        return None
+
+    def paginate(self, path, key, per_page):
+        """Yield every item of a paginated list endpoint, following the Link headers."""
+        url = f"{path}?per_page={per_page}"
+        while url:
+            data, headers = self.request("GET", url)
+            yield from data.get(key, [])
+            url = self._next_page(headers.get("link", ""))
+
+    def variables(self, repo):
+        return {v["name"].upper(): v for v in self.paginate(f"/repos/{repo}/actions/variables", "variables", VARIABLES_PER_PAGE)}
+
+    def secret_names(self, repo):
+        return {s["name"].upper() for s in self.paginate(f"/repos/{repo}/actions/secrets", "secrets", SECRETS_PER_PAGE)}
+
+    def public_key(self, repo):
+        """The repo's Actions public key as (key_id, key), fetched once per repo."""
+        with self._lock:
+            event = self._public_keys.get(repo)
+            fetch = event is None
+            if fetch:
+                event = self._public_keys[repo] = [threading.Event(), None]
+        if fetch:
+            try:
+                data, _ = self.request("GET", f"/repos/{repo}/actions/secrets/public-key")
+                event[1] = (data["key_id"], data["key"])
+            except Exception as e:
+                event[1] = e
+            event[0].set()
+        event[0].wait()
+        if isinstance(event[1], Exception):
+            raise event[1]
+        return event[1]
+
+
+def encrypt_secret(public_key, value):
+    """Encrypt value for GitHub with a sealed box for the repo's base64 public key."""
+    sealed_box = public.SealedBox(public.PublicKey(public_key.encode(), encoding.Base64Encoder()))
+    return base64.b64encode(sealed_box.encrypt(value.encode())).decode()
+
+
+# ---------------------------------------------------------------------------
+# Plan and apply
+# ---------------------------------------------------------------------------
+
+def plan_repo(api, repo, variables, secrets, skip_existing_secrets=False):
+    """Compare the config with what repo has, returning one change dict per configured key."""
+    existing_variables = api.variables(repo) if variables else {}
+    existing_secrets = api.secret_names(repo) if secrets else set()
+    changes = []
+    for name, value in variables.items():
+        current = existing_variables.get(name.upper())
+        if current is None:
+            action, previous = "Create", ""
+        else:
+            action, previous = ("Unchanged" if current["value"] == value else "Update"), current["value"]
+        changes.append({"repo": repo, "kind": "variable", "name": name, "value": value,
+                        "previous": previous, "action": action,
+                        "remote_name": current["name"] if current else name})
+    for name, value in secrets.items():
+        exists = name.upper() in existing_secrets
+        action = "Create" if not exists else ("Unchanged" if skip_existing_secrets else "Update")
+        changes.append({"repo": repo, "kind": "secret", "name": name.upper(), "value": value,
+                        "previous": "[ EXISTS ]" if exists else "", "action": action,
+                        "remote_name": name.upper()})
+    return changes
+
+
+def plan(api, repos, variables, secrets, jobs=JOBS, skip_existing_secrets=False):
+    """Plan every repo concurrently, keeping the repos in config order."""
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(plan_repo, api, repo, variables, secrets, skip_existing_secrets) for repo in repos]
+        return {repo: future.result() for repo, future in zip(repos, futures)}
+
+
+def apply_change(api, change):
+    """Make one change on GitHub, returning the status to report."""
+    repo, name = change["repo"], change["remote_name"]
+    if change["kind"] == "variable":
+        body = {"name": name, "value": change["value"]}
+        if change["action"] == "Create":
+            api.request("POST", f"/repos/{repo}/actions/variables", body)
+        else:
+            api.request("PATCH", f"/repos/{repo}/actions/variables/{urllib.parse.quote(name)}", body)
+    else:
+        key_id, key = api.public_key(repo)
+        api.request("PUT", f"/repos/{repo}/actions/secrets/{urllib.parse.quote(name)}",
+                    {"encrypted_value": encrypt_secret(key, change["value"]), "key_id": key_id})
+    return change["action"] + "d"
+
+
+def apply_changes(api, changes, jobs=JOBS):
+    """Apply every change that isn't Unchanged, jobs at a time, filling in status, timestamp and error."""
+    def run(change):
+        try:
+            change["status"] = apply_change(api, change)
+        except Exception as e:  # API, network, or encryption (a malformed public key): one failed row, not a failed run
+            change["status"], change["error"] = "Failed", str(e) or type(e).__name__
+        change["timestamp"] = datetime.now().strftime("%H:%M %p [ %d-%m-%Y ]")
+
+    pending = [change for change in changes if change["action"] != "Unchanged"]
+    for change in changes:
+        if change["action"] == "Unchanged":
+            change["status"], change["timestamp"] = "Unchanged", ""
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(run, pending))
+    return changes
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+def truncate_display(text, width):
+    return text[:width - 3] + "..." if len(text) > width else text
+
+
+def column_width(values, minimum, maximum):
+    longest = max((len(v) for v in values), default=0)
+    return min(minimum if longest < minimum else longest + 2, maximum)
+
+
+def print_changes(changes, title, applied=False):
+    """Print a NAME | CURRENT VALUE | PREV VALUE | STATUS | TIMESTAMP table like the bash script's."""
+    if not changes:
+        return
+    name_width = column_width([c["name"] for c in changes], NAME_MIN, NAME_MAX)
+    value_width = column_width([c["value"] for c in changes], VAL_MIN, VAL_MAX)
+    print(f"{BOLD}{title}{RESET}")
+    print(f"{'NAME':<{name_width}} | {'CURRENT VALUE':<{value_width}} | {'PREV VALUE':<{value_width}} | "
+          f"{'STATUS':<{STATUS_WIDTH}} | {'TIMESTAMP' if applied else ''}")
+    print(f"{'-' * name_width}-+-{'-' * value_width}-+-{'-' * value_width}-+-{'-' * STATUS_WIDTH}-+-{'-' * 32}")
+    for change in changes:
+        status = change["status"] if applied else change["action"]
+        color = STATUS_COLORS.get(status, "")
+        print(f"{truncate_display(change['name'], name_width):<{name_width}} | "
+              f"{truncate_display(change['value'], value_width):<{value_width}} | "
+              f"{truncate_display(change['previous'], value_width):<{value_width}} | "
+              f"{color}{status:<{STATUS_WIDTH}}{RESET if color else ''} | {change.get('timestamp', '') if applied else ''}")
+        if change.get("error"):
+            print(f"{RED}    {change['error']}{RESET}")
+    print()
+
+
+def print_plan(planned, applied=False):
+    for repo, changes in planned.items():
+        print(f"\n{CYAN}{BOLD}{repo}{RESET}\n")
+        print_changes([c for c in changes if c["kind"] == "variable"], "VARIABLES", applied)
+        print_changes([c for c in changes if c["kind"] == "secret"], "SECRETS", applied)
+
+
+def summarize(planned, key):
+    totals = {}
+    for changes in planned.values():
+        for change in changes:
+            totals[change[key]] = totals.get(change[key], 0) + 1
+    return ", ".join(f"{count} {status.lower()}" for status, count in sorted(totals.items())) or "nothing to do"
+
+
+def sanity_check():
+    """Ask to [A]ccept, [R]eload or [Q]uit, returning the first letter of the answer."""
+    while True:
+        print("Do you want to [A]ccept, [R]eload, or [Q]uit?")
+        try:
+            choice = input("Your choice: ").strip().lower()[:1]
+        except EOFError:
+            choice = "q"
+        if choice in ("a", "r", "q"):
+            return choice
+        print("Invalid choice. Please enter A, R, or Q.")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Create or update GitHub Actions variables and secrets from a YAML config, changing only what differs.")
+    parser.add_argument("--config", default=CONFIG_FILE, help="config file (default: %(default)s)")
+    parser.add_argument("--api-url", default=API_URL, help="GitHub API URL (default: $GITHUB_API_URL or %(default)s)")
+    parser.add_argument("--jobs", type=int, default=JOBS, help="requests in flight at once (default: %(default)s)")
+    parser.add_argument("--dry-run", action="store_true", help="show what would change and exit")
+    parser.add_argument("--yes", action="store_true", help="apply without asking")
+    parser.add_argument("--skip-existing-secrets", action="store_true", help="leave secrets that already exist alone")
+    args = parser.parse_args(argv)
+
+    api = None
+    try:
+        while True:
+            repos, token, variables, secrets = load_config(args.config)
+            if api is None:
+                api = GitHubAPI(args.api_url, token, pool_size=args.jobs)
+            api.token = token
+            print(f"\nSyncing {len(variables)} variables and {len(secrets)} secrets to {len(repos)} repos via {args.api_url}")
+            planned = plan(api, repos, variables, secrets, args.jobs, args.skip_existing_secrets)
+            print_plan(planned)
+            print(f"Plan: {summarize(planned, 'action')}")
+            changes = [c for repo_changes in planned.values() for c in repo_changes]
+            if all(c["action"] == "Unchanged" for c in changes) or args.dry_run:
+                return 0
+            if public is None and any(c["kind"] == "secret" and c["action"] != "Unchanged" for c in changes):
+                raise SyncError("secrets need PyNaCl to be encrypted with the repo's public key: pip install pynacl")
+            choice = "a" if args.yes else sanity_check()
+            if choice == "q":
+                print("Quitting. No changes made.")
+                return 0
+            if choice == "a":
+                break
+            print("Reloading configuration...")
+
+        started = time.perf_counter()
+        apply_changes(api, changes, args.jobs)
+        print_plan(planned, applied=True)
+        print(f"Done in {time.perf_counter() - started:.1f}s, {api.requests} API requests: {summarize(planned, 'status')}")
+        return 1 if any(c["status"] == "Failed" for c in changes) else 0
+    except SyncError as e:
+        print(f"{RED}Error: {e}{RESET}", file=sys.stderr)
+        return 2
+    except (GitHubAPIError, OSError, http.client.HTTPException) as e:
+        print(f"{RED}Error: {e}{RESET}", file=sys.stderr)
+        return 1
+    finally:
+        if api is not None:
+            api.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())